@@ -22,15 +22,24 @@ Environment Variables:
     USE_GITHUB_API: Set to "1" to use GitHub API instead of local git parsing
     GITHUB_TOKEN: Used for GitHub API authentication (auto-set in GitHub Actions)
 """
+import heapq
 import json
 import os
 import subprocess
 import sys
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
-from datetime import datetime, timezone
-from typing import Dict, Any, Optional
-from collections import defaultdict
+from typing import Dict, List, Any, Optional
+from itertools import chain
+from operator import itemgetter
 
+try:
+    import orjson  # Optional: faster serialization of profile-data.json
+except ImportError:
+    orjson = None
+
+from json_cache import JsonCache
 from parse_claude import parse_claude_sessions
 from parse_codex import parse_codex_sessions
 from parse_cursor import parse_cursor_sessions
@@ -51,17 +60,42 @@ def get_github_api_fetcher():
     return fetch_github_activity
 
 # Repos to exclude from dashboard (work projects, private exploration, etc.)
-EXCLUDED_REPOS = [
+EXCLUDED_REPOS = frozenset({
     "zeta",
-]
+})
+
+
+# Per-day counts merged in aggregate_metrics, in output order
+DAILY_BREAKDOWN_FIELDS = ("commits", "claude_sessions", "codex_sessions", "cursor_sessions", "gemini_sessions")
+
+# On-disk cache of repo name -> {url, config_mtime_ns}. Remotes rarely change,
+# so a repo's URL is reused until its .git/config is modified.
+REPO_URL_CACHE_FILE = Path(__file__).parent.parent / "data" / ".repo_url_cache.json"
 
 
-def get_github_url(repo_name: str, git_dir: Path) -> Optional[str]:
-    """Get GitHub URL if repo has GitHub remote"""
+def get_github_url(repo_name: str, git_dir: Path, cache: Optional[JsonCache] = None) -> Optional[str]:
+    """
+    Get GitHub URL if repo has GitHub remote.
+
+    When a cache is given, a hit whose .git/config mtime still matches
+    is returned without spawning git; misses are resolved and stored back.
+    """
     repo_path = git_dir / repo_name
     if not repo_path.exists() or not (repo_path / ".git").exists():
         return None
 
+    try:
+        config_mtime = (repo_path / ".git" / "config").stat().st_mtime_ns
+    except OSError:
+        config_mtime = None  # e.g. worktree with a .git file; don't cache
+
+    if cache is not None and config_mtime is not None:
+        cached = cache.get(repo_name)
+        if cached and cached.get("config_mtime_ns") == config_mtime:
+            cache.put(repo_name, cached)
+            return cached.get("url")
+
+    url = None
     try:
         result = subprocess.run(
             ["git", "-C", str(repo_path), "remote", "get-url", "origin"],
@@ -70,17 +104,24 @@ def get_github_url(repo_name: str, git_dir: Path) -> Optional[str]:
             timeout=2
         )
         if result.returncode == 0:
-            url = result.stdout.strip()
+            remote = result.stdout.strip()
             # Convert SSH to HTTPS for links
-            if "github.com" in url:
+            if "github.com" in remote:
                 # git@github.com:cipher982/repo.git -> https://github.com/cipher982/repo
-                url = url.replace("git@github.com:", "https://github.com/")
+                url = remote.replace("git@github.com:", "https://github.com/")
                 url = url.replace(".git", "")
-                return url
     except (subprocess.TimeoutExpired, subprocess.CalledProcessError):
-        pass
+        return None  # Transient failure, don't cache
+
+    if cache is not None and config_mtime is not None:
+        cache.put(repo_name, {"url": url, "config_mtime_ns": config_mtime})
+
+    return url
 
-    return None
+
+def _sum_field(records: List[Dict[str, Any]], field: str) -> int:
+    """Sum one numeric field across a list of records."""
+    return sum(map(itemgetter(field), records))
 
 
 def aggregate_metrics(github_data: Dict, claude_data: Dict, codex_data: Dict, cursor_data: Dict, gemini_data: Dict) -> Dict[str, Any]:
@@ -90,8 +131,11 @@ def aggregate_metrics(github_data: Dict, claude_data: Dict, codex_data: Dict, cu
     Returns complete profile-data.json structure
     """
 
-    # Filter out excluded repos from all data sources
+    # Filter out excluded repos from all data sources. Lists that contain no
+    # excluded repo (the common case) are returned as-is instead of copied.
     def filter_repos(repo_list):
+        if not EXCLUDED_REPOS or not any(r["repo"] in EXCLUDED_REPOS for r in repo_list):
+            return repo_list
         return [r for r in repo_list if r["repo"] not in EXCLUDED_REPOS]
 
     github_data["top_repos_7d"] = filter_repos(github_data["top_repos_7d"])
@@ -101,8 +145,8 @@ def aggregate_metrics(github_data: Dict, claude_data: Dict, codex_data: Dict, cu
 
     # Recalculate AI metrics after filtering
     # If repos list is empty (e.g., from API source), use sessions_7d directly
-    claude_sessions_filtered = sum(r["sessions"] for r in claude_data["repos"]) if claude_data["repos"] else claude_data["sessions_7d"]
-    codex_sessions_filtered = sum(r["sessions"] for r in codex_data["repos"]) if codex_data["repos"] else codex_data["sessions_7d"]
+    claude_sessions_filtered = _sum_field(claude_data["repos"], "sessions") if claude_data["repos"] else claude_data["sessions_7d"]
+    codex_sessions_filtered = _sum_field(codex_data["repos"], "sessions") if codex_data["repos"] else codex_data["sessions_7d"]
     cursor_sessions_filtered = cursor_data["sessions_7d"]  # No repo filtering available
     gemini_sessions_filtered = gemini_data["sessions_7d"]  # No repo filtering available
 
@@ -125,86 +169,66 @@ def aggregate_metrics(github_data: Dict, claude_data: Dict, codex_data: Dict, cu
     cursor_turns_pct = (cursor_turns_filtered / ai_turns_7d * 100) if ai_turns_7d > 0 else 0
     gemini_turns_pct = (gemini_turns_filtered / ai_turns_7d * 100) if ai_turns_7d > 0 else 0
 
-    # Combine top repos (commits + AI sessions)
-    repo_scores = defaultdict(lambda: {"commits": 0, "ai_sessions": 0})
-
-    # Add git commits
-    for repo_data in github_data["top_repos_7d"]:
-        repo_scores[repo_data["repo"]]["commits"] = repo_data["commits"]
-
-    # Add Claude sessions
-    for repo_data in claude_data["repos"]:
-        repo_scores[repo_data["repo"]]["ai_sessions"] += repo_data["sessions"]
-
-    # Add Codex sessions
-    for repo_data in codex_data["repos"]:
-        repo_scores[repo_data["repo"]]["ai_sessions"] += repo_data["sessions"]
-
-    # Sort by total activity (commits + sessions) and take top 5
-    top_repos_combined = []
+    # Combine top repos (commits + AI sessions): repo -> [commits, ai_sessions]
+    repo_scores = {}
+    for repo, field, count in chain(
+        ((r["repo"], 0, r["commits"]) for r in github_data["top_repos_7d"]),
+        ((r["repo"], 1, r["sessions"]) for r in claude_data["repos"]),
+        ((r["repo"], 1, r["sessions"]) for r in codex_data["repos"]),
+    ):
+        repo_scores.setdefault(repo, [0, 0])[field] += count
+
+    # Take top 5 by total activity (commits + sessions) before resolving
+    # GitHub URLs, so at most 5 git lookups run (concurrently)
+    top_repo_scores = heapq.nlargest(5, repo_scores.items(), key=lambda x: x[1][0] + x[1][1])
     git_dir = Path.home() / "git"
+    url_cache = JsonCache(REPO_URL_CACHE_FILE).load()
 
-    for repo, data in repo_scores.items():
-        github_url = get_github_url(repo, git_dir)
-        top_repos_combined.append({
+    with ThreadPoolExecutor(max_workers=5) as executor:
+        github_urls = list(executor.map(
+            lambda repo: get_github_url(repo, git_dir, url_cache),
+            [repo for repo, _ in top_repo_scores]
+        ))
+
+    top_repos_combined = [
+        {
             "repo": repo,
-            "commits": data["commits"],
-            "ai_sessions": data["ai_sessions"],
+            "commits": commits,
+            "ai_sessions": ai_sessions,
             "github_url": github_url
-        })
-
-    # Sort by commits first, then sessions
-    top_repos_combined.sort(key=lambda x: (x["commits"] + x["ai_sessions"]), reverse=True)
-    top_repos_combined = top_repos_combined[:5]
-
-    # Merge daily breakdowns from all sources
-    daily_breakdown = defaultdict(lambda: {"commits": 0, "claude_sessions": 0, "codex_sessions": 0, "cursor_sessions": 0, "gemini_sessions": 0, "total_sessions": 0})
-
-    # Add git commits
-    for day_data in github_data.get("daily_commits", []):
-        daily_breakdown[day_data["date"]]["commits"] = day_data["commits"]
-
-    # Add Claude sessions
-    for day_data in claude_data.get("daily_sessions", []):
-        daily_breakdown[day_data["date"]]["claude_sessions"] = day_data["sessions"]
-
-    # Add Codex sessions
-    for day_data in codex_data.get("daily_sessions", []):
-        daily_breakdown[day_data["date"]]["codex_sessions"] = day_data["sessions"]
-
-    # Add Cursor sessions
-    for day_data in cursor_data.get("daily_sessions", []):
-        daily_breakdown[day_data["date"]]["cursor_sessions"] = day_data["sessions"]
-
-    # Add Gemini sessions
-    for day_data in gemini_data.get("daily_sessions", []):
-        daily_breakdown[day_data["date"]]["gemini_sessions"] = day_data["sessions"]
-
-    # Calculate totals
-    for date in daily_breakdown:
-        daily_breakdown[date]["total_sessions"] = (
-            daily_breakdown[date]["claude_sessions"] +
-            daily_breakdown[date]["codex_sessions"] +
-            daily_breakdown[date]["cursor_sessions"] +
-            daily_breakdown[date]["gemini_sessions"]
-        )
+        }
+        for (repo, (commits, ai_sessions)), github_url in zip(top_repo_scores, github_urls)
+    ]
+
+    # Merge daily breakdowns from all sources as date -> row of counts,
+    # indexed like DAILY_BREAKDOWN_FIELDS (commits first, then each provider)
+    daily_breakdown = {}
+    daily_sources = (
+        (github_data.get("daily_commits", []), "commits"),
+        (claude_data.get("daily_sessions", []), "sessions"),
+        (codex_data.get("daily_sessions", []), "sessions"),
+        (cursor_data.get("daily_sessions", []), "sessions"),
+        (gemini_data.get("daily_sessions", []), "sessions"),
+    )
+    for idx, (days, count_key) in enumerate(daily_sources):
+        for day_data in days:
+            row = daily_breakdown.setdefault(day_data["date"], [0] * len(DAILY_BREAKDOWN_FIELDS))
+            row[idx] = day_data[count_key]
 
     # Convert to sorted array
-    # Always exclude the most recent date (likely partial/incomplete)
-    all_days_sorted = sorted(daily_breakdown.items())
-
-    # Take days excluding the most recent, then take last 7
-    if len(all_days_sorted) > 1:
-        complete_days = all_days_sorted[:-1]  # Drop most recent
-        daily_breakdown_array = [
-            {"date": date, **data}
-            for date, data in complete_days[-7:]  # Take last 7 complete
-        ]
-    else:
-        daily_breakdown_array = []
+    # Always exclude the most recent date (likely partial/incomplete): take the
+    # 8 newest dates, drop the newest, and return the rest oldest-first
+    complete_days = heapq.nlargest(8, daily_breakdown.items(), key=lambda kv: kv[0])[1:]
+    complete_days.reverse()
+    daily_breakdown_array = [
+        {"date": date, **dict(zip(DAILY_BREAKDOWN_FIELDS, row)), "total_sessions": sum(row[1:])}
+        for date, row in complete_days
+    ]
+
+    url_cache.save()
 
     return {
-        "generated_at": datetime.now(timezone.utc).isoformat(),
+        "generated_at": time.strftime("%Y-%m-%dT%H:%M:%S+00:00", time.gmtime()),
         "github": github_data,
         "claude": claude_data,
         "codex": codex_data,
@@ -249,28 +273,61 @@ def should_use_github_api() -> bool:
     return False
 
 
-def collect_ai_data_local() -> tuple[Dict, Dict, Dict, Dict]:
-    """Collect AI session data from local files."""
+# Local AI providers in report order: (result key, display label)
+LOCAL_AI_PROVIDERS = [
+    ("claude", "Claude"),
+    ("codex", "Codex"),
+    ("cursor", "Cursor"),
+    ("gemini", "Gemini"),
+]
+
+
+def submit_ai_data_local(executor: ThreadPoolExecutor) -> tuple[Dict[str, Future], Dict[str, List[str]]]:
+    """
+    Start parsing every local AI provider on the given pool.
+
+    Returns the futures and, per provider, the lines its parser logs; those
+    are printed by collect_ai_data_local rather than from the worker threads.
+    """
     home = Path.home()
     claude_sessions = home / ".claude" / "projects"
     codex_sessions = home / ".codex" / "sessions"
 
-    print("🔍 Collecting Claude sessions (local)...")
-    claude_data = parse_claude_sessions(claude_sessions)
-    print(f"   ✓ {claude_data['sessions_7d']} sessions, {claude_data['turns_7d']} turns (7d)")
-
-    print("🔍 Collecting Codex sessions (local)...")
-    codex_data = parse_codex_sessions(codex_sessions)
-    print(f"   ✓ {codex_data['sessions_7d']} sessions, {codex_data['turns_7d']} turns (7d)")
+    logs = {key: [] for key, _ in LOCAL_AI_PROVIDERS}
+    futures = {
+        "claude": executor.submit(parse_claude_sessions, claude_sessions),
+        "codex": executor.submit(parse_codex_sessions, codex_sessions),
+        "cursor": executor.submit(parse_cursor_sessions, log=logs["cursor"].append),
+        "gemini": executor.submit(parse_gemini_sessions, log=logs["gemini"].append),
+    }
+    return futures, logs
 
-    print("🔍 Collecting Cursor sessions (local)...")
-    cursor_data = parse_cursor_sessions()
-    print(f"   ✓ {cursor_data['sessions_7d']} sessions, {cursor_data['turns_7d']} turns (7d)")
 
-    print("🔍 Collecting Gemini sessions (local)...")
-    gemini_data = parse_gemini_sessions()
-    print(f"   ✓ {gemini_data['sessions_7d']} sessions, {gemini_data['turns_7d']} turns (7d)")
+def collect_ai_data_local(
+    submitted: Optional[tuple[Dict[str, Future], Dict[str, List[str]]]] = None,
+) -> tuple[Dict, Dict, Dict, Dict]:
+    """
+    Collect AI session data from local files.
 
+    Each provider walks an independent source, so they are parsed concurrently.
+    Pass the result of submit_ai_data_local() to reuse a pool that is already
+    running other work. Output prints in a fixed order as results land.
+    """
+    if submitted is None:
+        with ThreadPoolExecutor(max_workers=len(LOCAL_AI_PROVIDERS)) as executor:
+            return collect_ai_data_local(submit_ai_data_local(executor))
+
+    futures, logs = submitted
+    results = []
+    for key, label in LOCAL_AI_PROVIDERS:
+        data = futures[key].result()
+        print(f"🔍 Collecting {label} sessions (local)...")
+        for line in logs[key]:
+            print(line)
+        print(f"   ✓ {data['sessions_7d']} sessions, {data['turns_7d']} turns (7d)")
+        results.append(data)
+
+    claude_data, codex_data, cursor_data, gemini_data = results
     return claude_data, codex_data, cursor_data, gemini_data
 
 
@@ -319,32 +376,38 @@ def main():
     # Ensure output directory exists
     output_file.parent.mkdir(parents=True, exist_ok=True)
 
-    # Collect GitHub activity
     use_github_api = should_use_github_api()
-
-    if use_github_api:
-        print("🔍 Fetching GitHub activity from API...")
-        fetch_github = get_github_api_fetcher()
-        github_data = fetch_github()
-        print(f"   ✓ {github_data['commits_7d']} commits, {github_data['repos_active_7d']} repos (7d)")
-    elif git_dir.exists():
-        print("🔍 Collecting GitHub activity (local)...")
-        github_data = parse_github_activity(git_dir)
-        print(f"   ✓ {github_data['commits_7d']} commits, {github_data['repos_active_7d']} repos (7d)")
-    else:
-        print("⏭️  Skipping GitHub activity (no local git directory and no API)")
-        github_data = empty_github_data()
-
-    # Collect AI session data from either local files or Life Hub API
     use_api = should_use_life_hub_api()
 
-    if use_api:
-        ai_data = collect_ai_data_api()
-        if ai_data is None:
-            print("\n⚠️  Life Hub API failed, falling back to local parsing...")
-            ai_data = collect_ai_data_local()
-    else:
-        ai_data = collect_ai_data_local()
+    # Local parsers are independent and I/O-bound: the local AI providers and
+    # the local git scan run concurrently on one pool. API fetches run on this
+    # thread, one after another.
+    with ThreadPoolExecutor(max_workers=len(LOCAL_AI_PROVIDERS) + 1) as executor:
+        ai_futures = None if use_api else submit_ai_data_local(executor)
+
+        # Collect GitHub activity
+        if use_github_api:
+            print("🔍 Fetching GitHub activity from API...")
+            fetch_github = get_github_api_fetcher()
+            github_data = fetch_github()
+            print(f"   ✓ {github_data['commits_7d']} commits, {github_data['repos_active_7d']} repos (7d)")
+        elif git_dir.exists():
+            github_future = executor.submit(parse_github_activity, git_dir)
+            print("🔍 Collecting GitHub activity (local)...")
+            github_data = github_future.result()
+            print(f"   ✓ {github_data['commits_7d']} commits, {github_data['repos_active_7d']} repos (7d)")
+        else:
+            print("⏭️  Skipping GitHub activity (no local git directory and no API)")
+            github_data = empty_github_data()
+
+        # Collect AI session data from either local files or Life Hub API
+        if use_api:
+            ai_data = collect_ai_data_api()
+            if ai_data is None:
+                print("\n⚠️  Life Hub API failed, falling back to local parsing...")
+                ai_data = collect_ai_data_local(submit_ai_data_local(executor))
+        else:
+            ai_data = collect_ai_data_local(ai_futures)
 
     claude_data, codex_data, cursor_data, gemini_data = ai_data
 
@@ -352,8 +415,10 @@ def main():
     profile_data = aggregate_metrics(github_data, claude_data, codex_data, cursor_data, gemini_data)
 
     print(f"💾 Writing to {output_file}...")
-    with open(output_file, 'w') as f:
-        json.dump(profile_data, f, indent=2)
+    if orjson is not None:
+        output_file.write_bytes(orjson.dumps(profile_data, option=orjson.OPT_INDENT_2))
+    else:
+        output_file.write_text(json.dumps(profile_data, indent=2), encoding="utf-8")
 
     print("✅ Done!")
     print(f"\n📈 Summary:")
@@ -21,13 +21,40 @@ Environment Variables:
 
 import os
 import requests
-from typing import Dict, Any, Optional, List
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Optional, List, Tuple
 from collections import defaultdict
 from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from json_cache import JsonCache
+from timestamps import parse_ts
+
+try:
+    from orjson import loads as json_loads  # Optional: faster response decoding
+except ImportError:
+    from json import loads as json_loads
 
 
 DEFAULT_API_URL = "https://david010.longhouse.ai"
 PAGE_SIZE = 100
+MAX_PARALLEL_PAGES = 4
+
+# Session fields read by the aggregations below; the API returns many more,
+# which are dropped as pages arrive instead of being held for the whole run.
+SESSION_FIELDS = ("provider", "project", "started_at", "user_messages")
+
+# Shared session so paginated requests reuse one pooled TCP/TLS connection
+_SESSION = requests.Session()
+
+# Conditional-request cache: "days_back:offset" -> {etag, last_modified, body}.
+# Pages are requested with If-None-Match / If-Modified-Since; when the server
+# answers 304 the stored body is reused. Servers without validator support
+# simply return 200 every time. Local-only: pages include project names the
+# dashboard hides, so the file must never be uploaded (e.g. to an Actions cache).
+HTTP_CACHE_FILE = Path(__file__).parent.parent / "data" / ".longhouse_api_cache.json"
+
+_http_cache = JsonCache(HTTP_CACHE_FILE)
 
 
 def get_device_token() -> Optional[str]:
@@ -42,6 +69,13 @@ def get_api_url() -> str:
 def _fetch_sessions_page(token: str, days_back: int, offset: int) -> Optional[Dict[str, Any]]:
     url = f"{get_api_url()}/api/agents/sessions"
     headers = {"X-Agents-Token": token}
+    key = f"{days_back}:{offset}"
+    cached = _http_cache.get(key)
+    if cached:
+        if cached.get("etag"):
+            headers["If-None-Match"] = cached["etag"]
+        if cached.get("last_modified"):
+            headers["If-Modified-Since"] = cached["last_modified"]
     params = {
         "days_back": days_back,
         "limit": PAGE_SIZE,
@@ -50,13 +84,35 @@ def _fetch_sessions_page(token: str, days_back: int, offset: int) -> Optional[Di
         "hide_autonomous": "true",
     }
     try:
-        resp = requests.get(url, headers=headers, params=params, timeout=30)
+        resp = _SESSION.get(url, headers=headers, params=params, timeout=30)
+        if resp.status_code == 304 and cached:
+            _http_cache.put(key, cached)
+            return cached["body"]
         resp.raise_for_status()
-        return resp.json()
-    except requests.exceptions.RequestException as e:
+        body = json_loads(resp.content)
+    except (requests.exceptions.RequestException, ValueError) as e:
         print(f"   ⚠️  Longhouse API request failed: {e}")
         return None
 
+    etag = resp.headers.get("ETag")
+    last_modified = resp.headers.get("Last-Modified")
+    if etag or last_modified:
+        # Store the projected page; _project_sessions is idempotent on it
+        _http_cache.put(key, {
+            "etag": etag,
+            "last_modified": last_modified,
+            "body": {"total": body.get("total", 0), "sessions": _project_sessions(body)},
+        })
+    return body
+
+
+def _project_sessions(page: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Keep only the SESSION_FIELDS the aggregations read from each session."""
+    return [
+        {field: session[field] for field in SESSION_FIELDS if field in session}
+        for session in page.get("sessions", [])
+    ]
+
 
 def _fetch_all_sessions(token: str, days_back: int) -> Optional[List[Dict[str, Any]]]:
     """Fetch all sessions for the given window, paginating as needed."""
@@ -64,106 +120,112 @@ def _fetch_all_sessions(token: str, days_back: int) -> Optional[List[Dict[str, A
     if first is None:
         return None
 
-    sessions = list(first.get("sessions", []))
+    sessions = _project_sessions(first)
     total = first.get("total", 0)
 
-    offset = PAGE_SIZE
-    while offset < total:
-        page = _fetch_sessions_page(token, days_back, offset)
-        if page is None:
-            break
-        sessions.extend(page.get("sessions", []))
-        offset += PAGE_SIZE
+    # Remaining offsets are known from `total`, so fetch those pages
+    # concurrently; stop at the first failed page as before.
+    offsets = range(PAGE_SIZE, total, PAGE_SIZE)
+    if offsets:
+        with ThreadPoolExecutor(max_workers=MAX_PARALLEL_PAGES) as executor:
+            pages = executor.map(lambda offset: _fetch_sessions_page(token, days_back, offset), offsets)
+            for page in pages:
+                if page is None:
+                    break
+                sessions.extend(_project_sessions(page))
 
     return sessions
 
 
-def compute_daily_breakdown(sessions: List[Dict[str, Any]], days: int = 7) -> List[Dict[str, Any]]:
+def summarize_sessions(
+    sessions: List[Dict[str, Any]], now: datetime, days: int = 7
+) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]], Optional[Dict[str, Any]]]:
+    """
+    Daily breakdown (last `days` before `now`), per-repo totals, and last session.
+
+    Computed in one pass so each session's timestamp is parsed once and
+    feeds every aggregate, rather than separate helpers re-walking the list.
+    """
+    cutoff = now - timedelta(days=days)
+
     daily = defaultdict(lambda: {"sessions": 0, "turns": 0})
-    cutoff = datetime.now(timezone.utc) - timedelta(days=days)
+    repo_stats = defaultdict(lambda: {"sessions": 0, "turns": 0})
+    latest = None
+    latest_ts = None
 
     for session in sessions:
+        turns = session.get("user_messages") or 1
+
+        project = session.get("project")
+        if project:
+            repo_stats[project]["sessions"] += 1
+            repo_stats[project]["turns"] += turns
+
         started_at = session.get("started_at")
         if not started_at:
             continue
         try:
-            ts = datetime.fromisoformat(started_at.replace("Z", "+00:00"))
+            ts = parse_ts(started_at)
         except ValueError:
             continue
-        if ts < cutoff:
-            continue
-        date_str = ts.date().isoformat()
-        daily[date_str]["sessions"] += 1
-        daily[date_str]["turns"] += session.get("user_messages") or 1
 
-    return [
+        if latest_ts is None or ts > latest_ts:
+            latest = session
+            latest_ts = ts
+
+        if ts >= cutoff:
+            date_str = ts.date().isoformat()
+            daily[date_str]["sessions"] += 1
+            daily[date_str]["turns"] += turns
+
+    daily_sessions = [
         {"date": date, "sessions": data["sessions"], "turns": data["turns"]}
         for date, data in sorted(daily.items())
     ]
 
-
-def compute_repos_from_sessions(sessions: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-    repo_stats = defaultdict(lambda: {"sessions": 0, "turns": 0})
-    for session in sessions:
-        project = session.get("project")
-        if not project:
-            continue
-        repo_stats[project]["sessions"] += 1
-        repo_stats[project]["turns"] += session.get("user_messages") or 1
-
-    return [
+    repos = [
         {"repo": repo, "sessions": stats["sessions"], "turns": stats["turns"]}
         for repo, stats in sorted(repo_stats.items(), key=lambda x: x[1]["sessions"], reverse=True)
     ]
 
+    last_session = None
+    if latest is not None:
+        hours_ago = (now - latest_ts).total_seconds() / 3600
+        last_session = {
+            "repo": latest.get("project", "unknown"),
+            "timestamp": latest_ts.isoformat(),
+            "hours_ago": round(hours_ago, 2),
+        }
 
-def find_last_session(sessions: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
-    if not sessions:
-        return None
-    latest = None
-    latest_ts = None
-    for session in sessions:
-        started_at = session.get("started_at")
-        if not started_at:
-            continue
-        try:
-            ts = datetime.fromisoformat(started_at.replace("Z", "+00:00"))
-        except ValueError:
-            continue
-        if latest_ts is None or ts > latest_ts:
-            latest = session
-            latest_ts = ts
+    return daily_sessions, repos, last_session
 
-    if not latest or not latest_ts:
-        return None
 
-    hours_ago = (datetime.now(timezone.utc) - latest_ts).total_seconds() / 3600
-    return {
-        "repo": latest.get("project", "unknown"),
-        "timestamp": latest_ts.isoformat(),
-        "hours_ago": round(hours_ago, 2),
-    }
+def _index_by_provider(sessions: List[Dict[str, Any]]) -> Dict[str, List[Dict[str, Any]]]:
+    """Group sessions by lower-cased provider name in one pass."""
+    by_provider = defaultdict(list)
+    for session in sessions:
+        by_provider[(session.get("provider") or "").lower()].append(session)
+    return by_provider
 
 
 def _build_provider_data(
-    sessions_7d: List[Dict[str, Any]],
-    sessions_30d: List[Dict[str, Any]],
-    provider: str,
+    p7: List[Dict[str, Any]],
+    p30: List[Dict[str, Any]],
+    now: datetime,
 ) -> Dict[str, Any]:
-    p7 = [s for s in sessions_7d if s.get("provider", "").lower() == provider.lower()]
-    p30 = [s for s in sessions_30d if s.get("provider", "").lower() == provider.lower()]
-
+    """Provider summary from that provider's 7d and 30d sessions."""
     turns_7d = sum(s.get("user_messages") or 0 for s in p7)
     turns_30d = sum(s.get("user_messages") or 0 for s in p30)
+    daily_sessions, repos, last_session = summarize_sessions(p7, now, days=7)
 
     return {
         "sessions_7d": len(p7),
         "sessions_30d": len(p30),
         "turns_7d": turns_7d,
         "turns_30d": turns_30d,
-        "repos": compute_repos_from_sessions(p7),
-        "last_session": find_last_session(p7),
-        "daily_sessions": compute_daily_breakdown(p7, days=7),
+        "repos": repos,
+        "last_session": last_session,
+        "daily_sessions": daily_sessions,
     }
 
 
@@ -174,21 +236,38 @@ def fetch_all_providers() -> Optional[Dict[str, Dict[str, Any]]]:
         print("   ⚠️  No Longhouse device token found (LONGHOUSE_DEVICE_TOKEN or LIFE_HUB_API_KEY)")
         return None
 
-    print("   Fetching 7-day sessions...")
-    sessions_7d = _fetch_all_sessions(token, days_back=7)
-    if sessions_7d is None:
-        return None
-    print(f"   ✓ Got {len(sessions_7d)} sessions (7d)")
+    _http_cache.load()
+
+    # The 7d and 30d windows are independent requests; fetch them together
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        future_7d = executor.submit(_fetch_all_sessions, token, 7)
+        future_30d = executor.submit(_fetch_all_sessions, token, 30)
+
+        print("   Fetching 7-day sessions...")
+        sessions_7d = future_7d.result()
+        if sessions_7d is None:
+            return None
+        print(f"   ✓ Got {len(sessions_7d)} sessions (7d)")
+
+        print("   Fetching 30-day sessions...")
+        sessions_30d = future_30d.result()
+
+    _http_cache.save()
 
-    print("   Fetching 30-day sessions...")
-    sessions_30d = _fetch_all_sessions(token, days_back=30)
     if sessions_30d is None:
         print("   ⚠️  Failed to fetch 30-day sessions, using 7-day for 30d stats")
         sessions_30d = sessions_7d
 
+    # Index once instead of re-filtering both lists for every provider
+    by_provider_7d = _index_by_provider(sessions_7d)
+    by_provider_30d = _index_by_provider(sessions_30d)
+
+    # One reference time for every provider's cutoffs and hours_ago
+    now = datetime.now(timezone.utc)
+
     result = {}
     for provider in ["claude", "codex", "cursor", "gemini"]:
-        result[provider] = _build_provider_data(sessions_7d, sessions_30d, provider)
+        result[provider] = _build_provider_data(by_provider_7d[provider], by_provider_30d[provider], now)
         print(
             f"   ✓ {provider}: {result[provider]['sessions_7d']} sessions, "
             f"{result[provider]['turns_7d']} turns (7d)"
@@ -199,8 +278,6 @@ def fetch_all_providers() -> Optional[Dict[str, Dict[str, Any]]]:
 
 def main():
     """Test the Longhouse API fetch."""
-    import json
-
     token = get_device_token()
     if not token:
         print("Error: set LONGHOUSE_DEVICE_TOKEN or LIFE_HUB_API_KEY")
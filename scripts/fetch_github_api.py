@@ -10,19 +10,40 @@ Environment Variables:
     GITHUB_USERNAME: Optional. Defaults to 'cipher982'.
 """
 
+import heapq
+import json
 import os
+import time
 import requests
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from datetime import datetime, timezone, timedelta
 from collections import defaultdict
-from typing import Dict, Any, List, Optional
+from operator import itemgetter
+from pathlib import Path
+from typing import Dict, Any, Iterator, List, Optional, Tuple
+from urllib.parse import urlencode
+
+from json_cache import JsonCache
+from timestamps import parse_ts
+
+try:
+    from orjson import loads as json_loads  # Optional: faster response decoding
+except ImportError:
+    from json import loads as json_loads
 
 
 DEFAULT_USERNAME = "cipher982"
+GRAPHQL_URL = "https://api.github.com/graphql"
 
 # Repos to exclude (work projects, private, etc.)
-EXCLUDED_REPOS = [
+EXCLUDED_REPOS = frozenset({
     "zeta",
-]
+})
+
+# /search/commits serves at most this many results per query
+SEARCH_MAX_RESULTS = 1000
 
 
 def get_github_token() -> Optional[str]:
@@ -35,77 +56,220 @@ def get_username() -> str:
     return os.environ.get("GITHUB_USERNAME", DEFAULT_USERNAME)
 
 
-def _make_request(url: str, params: Optional[Dict] = None) -> Optional[Dict]:
-    """Make authenticated request to GitHub API."""
-    token = get_github_token()
-    headers = {
+def _build_session() -> requests.Session:
+    """
+    Create the shared API session.
+
+    One pooled session keeps TCP/TLS connections to api.github.com alive
+    across calls, retries transient failures, and carries the auth/accept
+    headers so individual requests don't rebuild them.
+    """
+    session = requests.Session()
+    retries = Retry(total=3, backoff_factor=0.3, status_forcelist=(429, 500, 502, 503, 504))
+    session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=16, max_retries=retries))
+    session.headers.update({
         "Accept": "application/vnd.github+json",
         "X-GitHub-Api-Version": "2022-11-28",
-    }
+    })
+    token = get_github_token()
     if token:
-        headers["Authorization"] = f"Bearer {token}"
+        session.headers["Authorization"] = f"Bearer {token}"
+    return session
 
-    try:
-        response = requests.get(url, headers=headers, params=params, timeout=30)
+
+_SESSION = _build_session()
+
+
+# On-disk conditional-request cache: request key -> {etag, body}. GitHub
+# answers If-None-Match with 304 Not Modified (not counted against the rate
+# limit), so unchanged pages cost a header-only round-trip. Local-only: bodies
+# are fetched with the token and can include private repos and author emails.
+HTTP_CACHE_FILE = Path(__file__).parent.parent / "data" / ".github_api_cache.json"
+
+_http_cache = JsonCache(HTTP_CACHE_FILE)
+
+# In-process memo of recent responses: request key -> (monotonic time, body,
+# has_next). Repeat calls within a run (or an interactive session) skip the
+# round-trip entirely instead of revalidating.
+MEMO_TTL_SECONDS = 300
+_memo: Dict[str, Tuple[float, Any, bool]] = {}
+
+
+def _cached_get(url: str, params: Optional[Dict] = None) -> Tuple[Any, bool]:
+    """
+    GET a JSON resource, revalidating any cached copy via its ETag.
+
+    Returns (body, has_next), where has_next reflects the response's
+    `Link: rel="next"` header. Raises requests.exceptions.RequestException
+    on failure.
+    """
+    key = f"{url}?{urlencode(sorted((params or {}).items()))}"
+    memoized = _memo.get(key)
+    if memoized and time.monotonic() - memoized[0] < MEMO_TTL_SECONDS:
+        cached = _http_cache.get(key)
+        if cached:
+            _http_cache.put(key, cached)
+        return memoized[1], memoized[2]
+
+    cached = _http_cache.get(key)
+    headers = {"If-None-Match": cached["etag"]} if cached else None
+
+    response = _SESSION.get(url, params=params, headers=headers, timeout=30)
+    if response.status_code == 304 and cached:
+        _http_cache.put(key, cached)
+        body = cached["body"]
+        has_next = cached.get("next", True)
+    else:
         response.raise_for_status()
-        return response.json()
-    except requests.exceptions.RequestException as e:
+        body = json_loads(response.content)
+        has_next = "next" in response.links
+        etag = response.headers.get("ETag")
+        if etag:
+            _http_cache.put(key, {"etag": etag, "body": body, "next": has_next})
+
+    _memo[key] = (time.monotonic(), body, has_next)
+    return body, has_next
+
+
+def _make_request(url: str, params: Optional[Dict] = None) -> Optional[Dict]:
+    """Make authenticated request to GitHub API."""
+    try:
+        return _cached_get(url, params)[0]
+    except (requests.exceptions.RequestException, ValueError) as e:
         print(f"   GitHub API request failed: {e}")
         return None
 
 
-def _make_paginated_request(url: str, params: Optional[Dict] = None, max_pages: int = 10) -> List[Dict]:
-    """Make paginated request to GitHub API."""
-    token = get_github_token()
-    headers = {
-        "Accept": "application/vnd.github+json",
-        "X-GitHub-Api-Version": "2022-11-28",
-    }
-    if token:
-        headers["Authorization"] = f"Bearer {token}"
-
-    all_items = []
+def _paginate(url: str, params: Optional[Dict] = None, max_pages: int = 10) -> Iterator[Dict]:
+    """Yield items from a paginated GitHub API listing, one page at a time."""
     params = params or {}
     params["per_page"] = 100
 
     for page in range(1, max_pages + 1):
         params["page"] = page
         try:
-            response = requests.get(url, headers=headers, params=params, timeout=30)
-            response.raise_for_status()
-            items = response.json()
-            if not items:
-                break
-            all_items.extend(items)
-            if len(items) < 100:
-                break
-        except requests.exceptions.RequestException as e:
+            items, has_next = _cached_get(url, params)
+        except (requests.exceptions.RequestException, ValueError) as e:
             print(f"   GitHub API request failed: {e}")
-            break
+            return
+        if not items:
+            return
+        yield from items
+        # GitHub omits rel="next" on the last page, which saves the extra
+        # request a full (100-item) final page would otherwise cost.
+        if not has_next or len(items) < 100:
+            return
 
-    return all_items
 
+def fetch_user_repos(username: str, since: Optional[datetime] = None) -> List[Dict]:
+    """
+    Fetch repos for a user (including private repos when authenticated).
 
-def fetch_user_repos(username: str) -> List[Dict]:
-    """Fetch all repos for a user (including private repos when authenticated)."""
+    Repos come back most recently pushed first, so with `since` the
+    listing stops at the first repo not pushed after it instead of
+    downloading every page.
+    """
     token = get_github_token()
     if token:
         # /user/repos includes private repos, requires PAT with repo scope
         url = "https://api.github.com/user/repos"
-        return _make_paginated_request(url, {"type": "owner", "sort": "pushed"})
     else:
         url = f"https://api.github.com/users/{username}/repos"
-        return _make_paginated_request(url, {"type": "owner", "sort": "pushed"})
+    repos = _paginate(url, {"type": "owner", "sort": "pushed"})
+    if since is None:
+        return list(repos)
+
+    recent = []
+    for repo in repos:
+        pushed_at = repo.get("pushed_at")
+        if not pushed_at:
+            continue
+        if parse_ts(pushed_at) <= since:
+            break
+        recent.append(repo)
+    return recent
 
 
-def fetch_repo_commits(owner: str, repo: str, since: datetime) -> List[Dict]:
-    """Fetch commits for a repo since a given date."""
+def fetch_repo_commits(owner: str, repo: str, since: datetime) -> Iterator[Dict]:
+    """
+    Iterate commits for a repo since a given date, page by page.
+
+    `since` is widened to the start of its UTC day so the request (and its
+    ETag cache key) is stable across same-day runs; callers filter by the
+    exact cutoff.
+    """
     url = f"https://api.github.com/repos/{owner}/{repo}/commits"
+    since_day = since.astimezone(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
     params = {
-        "since": since.isoformat(),
+        "since": since_day.isoformat(),
         "author": owner,  # Only commits by the owner
     }
-    return _make_paginated_request(url, params, max_pages=5)
+    return _paginate(url, params, max_pages=5)
+
+
+def _fetch_commit_dates(owner: str, repo: str, since: datetime) -> List[datetime]:
+    """
+    Authored dates of a repo's commits after `since`.
+
+    Consumes fetch_repo_commits lazily, keeping only each commit's date
+    rather than every commit payload across all pages.
+    """
+    commit_dates = []
+    for commit in fetch_repo_commits(owner, repo, since):
+        commit_date_str = commit.get("commit", {}).get("author", {}).get("date")
+        if not commit_date_str:
+            continue
+
+        commit_date = parse_ts(commit_date_str)
+        if commit_date > since:
+            commit_dates.append(commit_date)
+    return commit_dates
+
+
+def fetch_commit_dates_search(username: str, since: datetime) -> Optional[Dict[str, List[datetime]]]:
+    """
+    Authored dates of the user's commits after `since`, grouped by repo name.
+
+    One /search/commits listing covers every repo the user owns, instead of
+    one commits walk per repo. Returns None when search can't give the
+    complete answer (rate limited, incomplete, or over the 1000-result
+    cap) so the caller can fall back to per-repo requests.
+    """
+    url = "https://api.github.com/search/commits"
+    since_day = since.astimezone(timezone.utc).date().isoformat()
+    params = {
+        "q": f"author:{username} user:{username} author-date:>={since_day}",
+        "sort": "author-date",
+        "order": "desc",
+        "per_page": 100,
+    }
+
+    by_repo = defaultdict(list)
+    for page in range(1, SEARCH_MAX_RESULTS // 100 + 1):
+        params["page"] = page
+        try:
+            body, has_next = _cached_get(url, params)
+        except (requests.exceptions.RequestException, ValueError) as e:
+            print(f"   GitHub commit search failed: {e}")
+            return None
+        if body.get("incomplete_results") or body.get("total_count", 0) > SEARCH_MAX_RESULTS:
+            return None
+
+        items = body.get("items", [])
+        for item in items:
+            commit_date_str = item.get("commit", {}).get("author", {}).get("date")
+            repo_name = (item.get("repository") or {}).get("name")
+            if not commit_date_str or not repo_name:
+                continue
+
+            commit_date = parse_ts(commit_date_str)
+            if commit_date > since:
+                by_repo[repo_name].append(commit_date)
+
+        if not has_next or len(items) < 100:
+            break
+
+    return by_repo
 
 
 def detect_language(repo: Dict) -> Optional[str]:
@@ -113,6 +277,27 @@ def detect_language(repo: Dict) -> Optional[str]:
     return repo.get("language")
 
 
+def _graphql(query: str, variables: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """POST a GraphQL query and return its `data` payload, or None on failure."""
+    try:
+        resp = _SESSION.post(
+            GRAPHQL_URL,
+            json={"query": query, "variables": variables},
+            timeout=30,
+        )
+        resp.raise_for_status()
+        body = json_loads(resp.content)
+    except (requests.exceptions.RequestException, ValueError) as e:
+        print(f"   GraphQL request failed: {e}")
+        return None
+
+    if not isinstance(body, dict) or not body.get("data"):
+        errors = body.get("errors") if isinstance(body, dict) else body
+        print(f"   GraphQL request returned no data: {errors}")
+        return None
+    return body["data"]
+
+
 def fetch_contribution_calendar(username: str) -> List[Dict[str, Any]]:
     """Fetch the past-year daily contribution calendar via GraphQL.
 
@@ -135,19 +320,16 @@ def fetch_contribution_calendar(username: str) -> List[Dict[str, Any]]:
       }
     }
     """
+    data = _graphql(query, {"login": username})
+    if data is None:
+        return []
+
     try:
-        resp = requests.post(
-            "https://api.github.com/graphql",
-            headers={"Authorization": f"Bearer {token}"},
-            json={"query": query, "variables": {"login": username}},
-            timeout=30,
-        )
-        resp.raise_for_status()
         weeks = (
-            resp.json()["data"]["user"]["contributionsCollection"]
+            data["user"]["contributionsCollection"]
             ["contributionCalendar"]["weeks"]
         )
-    except (requests.exceptions.RequestException, KeyError, TypeError) as e:
+    except (KeyError, TypeError) as e:
         print(f"   GraphQL contribution calendar fetch failed: {e}")
         return []
 
@@ -158,10 +340,160 @@ def fetch_contribution_calendar(username: str) -> List[Dict[str, Any]]:
     ]
 
 
+# Owned repos, most recently pushed first, with the owner's default-branch
+# commits since $since30 (dates for the first 100, exact totals for 7d/30d).
+REPO_ACTIVITY_QUERY = """
+query($login: String!, $authorId: ID!, $since7: GitTimestamp!, $since30: GitTimestamp!, $cursor: String) {
+  user(login: $login) {
+    repositories(first: 100, after: $cursor, ownerAffiliations: OWNER,
+                 orderBy: {field: PUSHED_AT, direction: DESC}) {
+      pageInfo { hasNextPage endCursor }
+      nodes {
+        name
+        isFork
+        pushedAt
+        primaryLanguage { name }
+        defaultBranchRef {
+          target {
+            ... on Commit {
+              recent: history(since: $since7, author: {id: $authorId}) { totalCount }
+              history(first: 100, since: $since30, author: {id: $authorId}) {
+                totalCount
+                nodes { authoredDate }
+              }
+            }
+          }
+        }
+      }
+    }
+  }
+}
+"""
+
+
+def fetch_repo_activity_graphql(username: str, since_7d: datetime, since_30d: datetime) -> Optional[List[Dict[str, Any]]]:
+    """
+    Per-repo commit activity for the last 30 days from GraphQL.
+
+    Replaces the repo listing plus one paginated commits walk per repo with
+    one query per 100 repos. Returns None if GraphQL is unavailable so the
+    caller can fall back to REST.
+    """
+    data = _graphql("query($login: String!) { user(login: $login) { id } }", {"login": username})
+    if not data or not data.get("user"):
+        return None
+    author_id = data["user"]["id"]
+
+    activity = []
+    cursor = None
+    while True:
+        data = _graphql(REPO_ACTIVITY_QUERY, {
+            "login": username,
+            "authorId": author_id,
+            "since7": since_7d.isoformat(),
+            "since30": since_30d.isoformat(),
+            "cursor": cursor,
+        })
+        if data is None or not data.get("user"):
+            return None
+
+        repositories = data["user"]["repositories"]
+        reached_stale = False
+        for node in repositories["nodes"]:
+            pushed_at = node.get("pushedAt")
+            if not pushed_at:
+                continue
+            # Sorted by push time, so everything after this is stale too
+            if parse_ts(pushed_at) <= since_30d:
+                reached_stale = True
+                break
+
+            if node["name"] in EXCLUDED_REPOS or node.get("isFork"):
+                continue
+
+            target = (node.get("defaultBranchRef") or {}).get("target") or {}
+            history = target.get("history")
+            if not history:
+                continue  # Empty repo
+
+            commit_dates = []
+            for commit in history["nodes"]:
+                commit_date = parse_ts(commit["authoredDate"])
+                if commit_date > since_30d:
+                    commit_dates.append(commit_date)
+
+            activity.append({
+                "repo": node["name"],
+                "language": (node.get("primaryLanguage") or {}).get("name"),
+                "commits_7d": target["recent"]["totalCount"],
+                "commits_30d": history["totalCount"],
+                "commit_dates": commit_dates,
+            })
+
+        page_info = repositories["pageInfo"]
+        if reached_stale or not page_info["hasNextPage"]:
+            break
+        cursor = page_info["endCursor"]
+
+    print(f"   Found {len(activity)} recently active repos")
+    return activity
+
+
+def fetch_repo_activity_rest(username: str, since_7d: datetime, since_30d: datetime) -> List[Dict[str, Any]]:
+    """Per-repo commit activity for the last 30 days from the REST API."""
+    print(f"   Fetching repos for {username}...")
+    # Only repos pushed in the window, to avoid too many API calls
+    recent_repos = fetch_user_repos(username, since=since_30d)
+
+    print(f"   Checking {len(recent_repos)} recently active repos...")
+
+    # Skip excluded repos and forks
+    candidate_repos = [
+        r for r in recent_repos
+        if r["name"] not in EXCLUDED_REPOS and not r.get("fork")
+    ]
+
+    # One commit search covers every repo; walk repos one by one only
+    # when search can't answer (e.g. its 30 requests/min limit is hit).
+    commits_by_repo = fetch_commit_dates_search(username, since_30d)
+    if commits_by_repo is not None:
+        repo_commit_dates = [
+            (repo, commits_by_repo.get(repo["name"], []))
+            for repo in candidate_repos
+        ]
+    else:
+        print("   Falling back to per-repo commit walk...")
+        # Commit fetches are independent HTTP round-trips, so run them on a
+        # pool (sharing _SESSION's connections). Results are consumed in
+        # submission order, keeping the list in the same order as the repos.
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            futures = [
+                (repo, executor.submit(_fetch_commit_dates, username, repo["name"], since_30d))
+                for repo in candidate_repos
+            ]
+        repo_commit_dates = [(repo, future.result()) for repo, future in futures]
+
+    activity = []
+    for repo, commit_dates in repo_commit_dates:
+        activity.append({
+            "repo": repo["name"],
+            "language": detect_language(repo),
+            "commits_7d": sum(1 for d in commit_dates if d > since_7d),
+            "commits_30d": len(commit_dates),
+            "commit_dates": commit_dates,
+        })
+
+    return activity
+
+
 def fetch_github_activity(username: Optional[str] = None) -> Dict[str, Any]:
     """
     Fetch GitHub activity via API.
 
+    Uses a single GraphQL repo/history query when a token is available and
+    falls back to the REST repo listing + commit search (or per-repo
+    commits walk) otherwise.
+
     Returns same format as parse_github.py:
         {
             "repos_active_7d": int,
@@ -179,9 +511,19 @@ def fetch_github_activity(username: Optional[str] = None) -> Dict[str, Any]:
     since_7d = now - timedelta(days=7)
     since_30d = now - timedelta(days=30)
 
-    print(f"   Fetching repos for {username}...")
-    repos = fetch_user_repos(username)
-    print(f"   Found {len(repos)} repos")
+    _http_cache.load()
+
+    activity = None
+    if get_github_token():
+        print(f"   Fetching repo activity for {username} (GraphQL)...")
+        activity = fetch_repo_activity_graphql(username, since_7d, since_30d)
+        if activity is None:
+            print("   Falling back to REST repo/commit walk...")
+    if activity is None:
+        activity = fetch_repo_activity_rest(username, since_7d, since_30d)
+        # Only the REST path goes through _http_cache; saving after a GraphQL
+        # run would overwrite the file with no entries
+        _http_cache.save()
 
     repos_7d = set()
     repos_30d = set()
@@ -190,79 +532,50 @@ def fetch_github_activity(username: Optional[str] = None) -> Dict[str, Any]:
     repo_commits_7d = defaultdict(int)
     language_commits_30d = defaultdict(int)
     daily_commits = defaultdict(int)
-    last_push_data = None
     last_push_time = None
+    last_push_repo = None
 
-    # Filter to recently pushed repos to avoid too many API calls
-    recent_repos = [r for r in repos if r.get("pushed_at")]
-    recent_repos = [
-        r for r in recent_repos
-        if datetime.fromisoformat(r["pushed_at"].replace("Z", "+00:00")) > since_30d
-    ]
-
-    print(f"   Checking {len(recent_repos)} recently active repos...")
-
-    for repo in recent_repos:
-        repo_name = repo["name"]
-
-        # Skip excluded repos
-        if repo_name in EXCLUDED_REPOS:
-            continue
-
-        # Skip forks unless they have commits
-        if repo.get("fork"):
-            continue
-
-        commits = fetch_repo_commits(username, repo_name, since_30d)
+    for repo in activity:
+        repo_name = repo["repo"]
 
-        commits_7d_list = []
-        commits_30d_list = []
+        for commit_date in repo["commit_dates"]:
+            # Per-repo daily tally; used as a fallback for the calendar
+            # when the GraphQL contribution feed is unavailable.
+            date_str = commit_date.date().isoformat()
+            daily_commits[date_str] += 1
 
-        for commit in commits:
-            commit_date_str = commit.get("commit", {}).get("author", {}).get("date")
-            if not commit_date_str:
-                continue
+            # Track last push
+            if last_push_time is None or commit_date > last_push_time:
+                last_push_time = commit_date
+                last_push_repo = repo_name
 
-            commit_date = datetime.fromisoformat(commit_date_str.replace("Z", "+00:00"))
-
-            if commit_date > since_30d:
-                commits_30d_list.append(commit)
-                # Per-repo daily tally; used as a fallback for the calendar
-                # when the GraphQL contribution feed is unavailable.
-                date_str = commit_date.date().isoformat()
-                daily_commits[date_str] += 1
-
-                if commit_date > since_7d:
-                    commits_7d_list.append(commit)
-
-                # Track last push
-                if last_push_time is None or commit_date > last_push_time:
-                    last_push_time = commit_date
-                    hours_ago = (now - commit_date).total_seconds() / 3600
-                    last_push_data = {
-                        "repo": repo_name,
-                        "timestamp": commit_date.isoformat(),
-                        "hours_ago": round(hours_ago, 2)
-                    }
-
-        if commits_7d_list:
+        if repo["commits_7d"]:
             repos_7d.add(repo_name)
-            commits_7d_total += len(commits_7d_list)
-            repo_commits_7d[repo_name] = len(commits_7d_list)
+            commits_7d_total += repo["commits_7d"]
+            repo_commits_7d[repo_name] = repo["commits_7d"]
 
-        if commits_30d_list:
+        if repo["commits_30d"]:
             repos_30d.add(repo_name)
-            commits_30d_total += len(commits_30d_list)
+            commits_30d_total += repo["commits_30d"]
 
             # Track language
-            language = detect_language(repo)
+            language = repo["language"]
             if language:
-                language_commits_30d[language] += len(commits_30d_list)
+                language_commits_30d[language] += repo["commits_30d"]
 
     # Format results
+    last_push_data = None
+    if last_push_time is not None:
+        hours_ago = (now - last_push_time).total_seconds() / 3600
+        last_push_data = {
+            "repo": last_push_repo,
+            "timestamp": last_push_time.isoformat(),
+            "hours_ago": round(hours_ago, 2)
+        }
+
     top_repos = [
         {"repo": repo, "commits": count}
-        for repo, count in sorted(repo_commits_7d.items(), key=lambda x: x[1], reverse=True)[:5]
+        for repo, count in heapq.nlargest(5, repo_commits_7d.items(), key=itemgetter(1))
     ]
 
     languages = [
@@ -296,8 +609,6 @@ def fetch_github_activity(username: Optional[str] = None) -> Dict[str, Any]:
 
 def main():
     """Test the GitHub API fetch."""
-    import json
-
     print("Testing GitHub API fetch...")
 
     token = get_github_token()
@@ -4,47 +4,80 @@
 The project lists in TEMPLATE.md are curated by hand. This script only fills
 the dynamic build-cadence numbers and language badges from the collected data.
 """
-import json
+import re
+from functools import lru_cache
 from pathlib import Path
-from datetime import datetime
 from typing import Dict, Any
 
+from timestamps import parse_ts
+
+try:
+    from orjson import loads as json_loads  # Optional: faster data file parsing
+except ImportError:
+    from json import loads as json_loads
+
+
+TEMPLATE_PATH = Path(__file__).parent.parent / "TEMPLATE.md"
+_UPDATED_FMT = "%Y-%m-%d %H:%M UTC"
+
+# Placeholders filled by generate_readme, in the order its values are built
+_PLACEHOLDERS = (
+    "{{LANGUAGE_BADGES}}",
+    "{{COMMITS_30D}}",
+    "{{REPOS_30D}}",
+    "{{AI_SESSIONS_30D}}",
+    "{{UPDATED_AT}}",
+)
+
+# Every {{PLACEHOLDER}} is filled in one scan of the template
+_PLACEHOLDER_RE = re.compile(r"\{\{[A-Z0-9_]+\}\}")
+
+
+@lru_cache(maxsize=1)
+def _load_template(path: Path) -> str:
+    return path.read_text(encoding="utf-8")
+
+
+BADGE_COLORS = {
+    "Python": "3776AB",
+    "TypeScript": "3178C6",
+    "JavaScript": "F7DF1E",
+    "Go": "00ADD8",
+    "Rust": "000000",
+    "Shell": "89e051",
+    "Swift": "F05138",
+    "C++": "00599C",
+}
+
+
+def _badge(name: str, color: str) -> str:
+    slug = name.lower().replace("+", "%2B")
+    return (
+        f"![{name}](https://img.shields.io/badge/{name}-{color}"
+        f"?style=flat-square&logo={slug}&logoColor=white)"
+    )
+
+
+# Badges for the known palette are built once; others fall back to gray.
+_BADGE_CACHE = {name: _badge(name, color) for name, color in BADGE_COLORS.items()}
+
 
 def generate_language_badges(data: Dict[str, Any]) -> str:
     """Top-3 language badges from the 30-day commit breakdown."""
     languages = data["github"]["languages_30d"][:3]
 
-    badge_colors = {
-        "Python": "3776AB",
-        "TypeScript": "3178C6",
-        "JavaScript": "F7DF1E",
-        "Go": "00ADD8",
-        "Rust": "000000",
-        "Shell": "89e051",
-        "Swift": "F05138",
-        "C++": "00599C",
-    }
-
-    badges = []
-    for lang in languages:
-        name = lang["name"]
-        color = badge_colors.get(name, "gray")
-        slug = name.lower().replace("+", "%2B")
-        badges.append(
-            f"![{name}](https://img.shields.io/badge/{name}-{color}"
-            f"?style=flat-square&logo={slug}&logoColor=white)"
-        )
+    badges = [
+        _BADGE_CACHE.get(lang["name"]) or _badge(lang["name"], "gray")
+        for lang in languages
+    ]
 
     return " ".join(badges)
 
 
 def generate_readme(data: Dict[str, Any]) -> str:
-    template_path = Path(__file__).parent.parent / "TEMPLATE.md"
-    with open(template_path) as f:
-        template = f.read()
+    template = _load_template(TEMPLATE_PATH)
 
     gh = data["github"]
-    agg = data["aggregate"]
 
     # 30-day agent sessions across all providers.
     ai_sessions_30d = sum(
@@ -52,21 +85,18 @@ def generate_readme(data: Dict[str, Any]) -> str:
         for tool in ("claude", "codex", "cursor", "gemini")
     )
 
-    replacements = {
-        "{{LANGUAGE_BADGES}}": generate_language_badges(data),
-        "{{COMMITS_30D}}": f"{gh['commits_30d']:,}",
-        "{{REPOS_30D}}": str(gh["repos_active_30d"]),
-        "{{AI_SESSIONS_30D}}": str(ai_sessions_30d),
-        "{{UPDATED_AT}}": datetime.fromisoformat(
-            data["generated_at"].replace("Z", "+00:00")
-        ).strftime("%Y-%m-%d %H:%M UTC"),
-    }
-
-    readme = template
-    for placeholder, value in replacements.items():
-        readme = readme.replace(placeholder, value)
+    # Same order as _PLACEHOLDERS
+    values = (
+        generate_language_badges(data),
+        f"{gh['commits_30d']:,}",
+        str(gh["repos_active_30d"]),
+        str(ai_sessions_30d),
+        parse_ts(data["generated_at"]).strftime(_UPDATED_FMT),
+    )
+    replacements = dict(zip(_PLACEHOLDERS, values))
 
-    return readme
+    # Unknown placeholders are left as-is, as with per-key str.replace
+    return _PLACEHOLDER_RE.sub(lambda m: replacements.get(m.group(0), m.group(0)), template)
 
 
 def main():
@@ -77,14 +107,17 @@ def main():
         print(f"Error: {data_file} not found. Run collect_data.py first.")
         return
 
-    with open(data_file) as f:
-        data = json.load(f)
+    data = json_loads(data_file.read_bytes())
 
     print("📝 Generating README from template...")
     readme = generate_readme(data)
 
-    with open(output_file, "w") as f:
-        f.write(readme)
+    new_bytes = readme.encode()
+    if output_file.exists() and output_file.read_bytes() == new_bytes:
+        print(f"✅ README unchanged: {output_file}")
+        return
+
+    output_file.write_bytes(new_bytes)
 
     print(f"✅ README written to {output_file}")
 
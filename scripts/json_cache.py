@@ -0,0 +1,49 @@
+"""Small on-disk JSON caches shared by the collectors and parsers."""
+import json
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+try:
+    from orjson import loads as json_loads  # Optional: faster cache loading
+except ImportError:
+    from json import loads as json_loads
+
+
+class JsonCache:
+    """
+    A JSON object on disk mapping string keys to cache entries.
+
+    Entries read or written this run are recorded with put(); save() persists
+    only those, so keys that are no longer requested age out. A missing or
+    corrupt file loads as empty, and saving is best effort.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.entries: Dict[str, Any] = {}
+        self.used: Dict[str, Any] = {}
+
+    def load(self) -> "JsonCache":
+        """(Re)load the file, forgetting which entries were used."""
+        try:
+            cache = json_loads(self.path.read_bytes())
+        except (OSError, ValueError):
+            cache = {}
+        self.entries = cache if isinstance(cache, dict) else {}
+        self.used = {}
+        return self
+
+    def get(self, key: str) -> Optional[Any]:
+        return self.entries.get(key)
+
+    def put(self, key: str, entry: Any) -> None:
+        """Store an entry (or keep an existing one) and mark it used."""
+        self.entries[key] = self.used[key] = entry
+
+    def save(self) -> None:
+        """Persist the entries used this run."""
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self.path.write_text(json.dumps(self.used), encoding="utf-8")
+        except OSError:
+            pass
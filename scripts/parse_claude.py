@@ -1,11 +1,23 @@
 """Parse Claude Code session data from ~/.claude/projects/"""
 import json
+import os
+from functools import lru_cache
 from pathlib import Path
 from datetime import datetime, timezone, timedelta
-from collections import defaultdict
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Any, Optional
 
+try:
+    from orjson import loads as json_loads  # Optional: faster JSON decoding
+except ImportError:
+    from json import loads as json_loads
 
+from json_cache import JsonCache
+from session_files import MAX_WORKERS, read_session_head, scandir_jsonl
+
+
+@lru_cache(maxsize=1024)  # Many sessions share a cwd
 def extract_repo_from_cwd(cwd: str) -> str:
     """Extract meaningful name from working directory"""
     if not cwd:
@@ -28,26 +40,62 @@ def extract_repo_from_cwd(cwd: str) -> str:
     return path.name if path.name else "unknown"
 
 
+# Per-file metadata cache: path -> {mtime_ns, size, cwd, timestamp, session_id,
+# turns}. Session logs are append-only, so a file whose mtime and size are
+# unchanged since the last run doesn't need to be opened again.
+SESSION_CACHE_FILE = Path(__file__).parent.parent / "data" / ".claude_session_cache.json"
+
+
 # Global cache: directory slug -> cwd path
 _slug_cache = {}
 
 
-def find_field_in_session(lines: List[str], field: str) -> Optional[Any]:
+# Metadata fields are looked up in at most this many leading lines
+HEAD_LINES = 10
+
+
+def find_field_in_session(lines: List[bytes], field: str) -> Optional[Any]:
     """
     Walk session lines until we find a non-null value for the given field.
     Some sessions start with summary objects; metadata appears on line 2+.
     """
-    for line in lines[:10]:  # Check first 10 lines max
+    for line in lines[:HEAD_LINES]:
         try:
-            obj = json.loads(line)
+            obj = json_loads(line)
             value = obj.get(field)
             if value and value != "null":
                 return value
-        except json.JSONDecodeError:
+        except ValueError:  # Malformed JSON or undecodable bytes
             continue
     return None
 
 
+def read_session_meta(
+    entry: os.DirEntry,
+    cache: JsonCache,
+) -> Dict[str, Any]:
+    """
+    Metadata for one session file, reusing `cache` when the file is unchanged.
+
+    Every entry returned is marked used, so deleted files drop out of the
+    saved cache. `turns` is 0 for an empty file.
+    """
+    st = entry.stat()
+    meta = cache.get(entry.path)
+    if not meta or meta.get("mtime_ns") != st.st_mtime_ns or meta.get("size") != st.st_size:
+        lines, turns = read_session_head(Path(entry.path), HEAD_LINES)
+        meta = {
+            "mtime_ns": st.st_mtime_ns,
+            "size": st.st_size,
+            "cwd": find_field_in_session(lines, "cwd"),
+            "timestamp": find_field_in_session(lines, "timestamp"),
+            "session_id": find_field_in_session(lines, "sessionId"),
+            "turns": turns,
+        }
+    cache.put(entry.path, meta)
+    return meta
+
+
 def resolve_cwd_from_slug(slug: str) -> Optional[str]:
     """
     Resolve cwd using cached slug→cwd mappings.
@@ -71,105 +119,127 @@ def parse_claude_sessions(sessions_dir: Path, days_back: int = 7) -> Dict[str, A
     """
     cutoff_7d = datetime.now(timezone.utc) - timedelta(days=7)
     cutoff_30d = datetime.now(timezone.utc) - timedelta(days=30)
-
-    sessions_7d = []
-    sessions_30d = []
+    # ISO-8601 UTC ("...Z") strings sort chronologically, so older sessions
+    # can be rejected by string comparison before any datetime is built
+    cutoff_30d_iso = cutoff_30d.strftime("%Y-%m-%dT%H:%M:%S")
+
+    # 7-day figures are aggregated as sessions are seen, not kept per session
+    sessions_7d = 0
+    turns_7d = 0
+    repo_sessions_7d = Counter()
+    repo_turns_7d = Counter()
+    latest_ts = None
+    latest_repo = None
+    sessions_30d = 0
+    turns_30d = 0
     sessions_by_date = defaultdict(lambda: {"sessions": 0, "turns": 0})
 
-    # Find all session files
-    session_files = list(sessions_dir.rglob("*.jsonl"))
-
-    # First pass: build slug cache from sessions with valid cwd
-    for session_file in session_files:
-        try:
-            with open(session_file, 'r') as f:
-                lines = f.readlines()
-
-            if not lines:
-                continue
+    # Find all session files. A file last written before the 30-day window
+    # can't hold a session inside it (its start timestamp is older still), so
+    # it is set aside unread, needed at most for the slug fallback below.
+    cutoff_30d_epoch = cutoff_30d.timestamp()
+    session_files = []
+    stale_files = []
+    for entry in scandir_jsonl(str(sessions_dir)):
+        if entry.stat().st_mtime < cutoff_30d_epoch:
+            stale_files.append(entry)
+        else:
+            session_files.append(entry)
+
+    meta_cache = JsonCache(SESSION_CACHE_FILE).load()
+
+    # Single pass over the files: each head is read once, and files that
+    # record their own cwd also fill the slug cache as they go
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        metas = list(executor.map(
+            lambda entry: read_session_meta(entry, meta_cache),
+            session_files,
+        ))
+
+    resolved = []  # (cwd, meta)
+    pending = []   # (slug, meta) for sessions with no cwd of their own
+    for entry, meta in zip(session_files, metas):
+        if not meta["turns"]:
+            continue
 
-            cwd = find_cwd_in_session(lines)
+        # Find cwd (walks multiple lines for summary-first files)
+        slug = Path(entry.path).parent.name
+        cwd = meta["cwd"]
+        if cwd:
+            _slug_cache[slug] = cwd
+            resolved.append((cwd, meta))
+        else:
+            pending.append((slug, meta))
+
+    # Slugs still unknown may be recorded only in stale files; read just those
+    unresolved = {slug for slug, _ in pending if slug not in _slug_cache}
+    for entry in stale_files:
+        slug = Path(entry.path).parent.name
+        if slug in unresolved:
+            cwd = read_session_meta(entry, meta_cache)["cwd"]
             if cwd:
-                slug = session_file.parent.name
                 _slug_cache[slug] = cwd
-        except Exception:
-            continue
-
-    # Second pass: parse sessions with fallback to cache
-    for session_file in session_files:
-        try:
-            with open(session_file, 'r') as f:
-                lines = f.readlines()
-
-            if not lines:
-                continue
-
-            # Find cwd (walks multiple lines for summary-first files)
-            cwd = find_field_in_session(lines, "cwd")
 
-            # Fallback: use slug cache
-            if not cwd:
-                slug = session_file.parent.name
-                cwd = resolve_cwd_from_slug(slug)
+    # Fallback: use slug cache, complete now that every file has been seen
+    for slug, meta in pending:
+        cwd = resolve_cwd_from_slug(slug)
+        if cwd:  # Still no cwd, skip session
+            resolved.append((cwd, meta))
 
-            if not cwd:
-                continue  # Still no cwd, skip session
+    for cwd, meta in resolved:
+        try:
+            turn_count = meta["turns"]
 
             # Find timestamp (also walks multiple lines)
-            timestamp_str = find_field_in_session(lines, "timestamp")
-            session_id = find_field_in_session(lines, "sessionId")
+            timestamp_str = meta["timestamp"]
 
             if not timestamp_str:
                 continue
 
+            # Fast reject: outside the 30-day window
+            if timestamp_str[-1:] == "Z" and timestamp_str[10:11] == "T" and timestamp_str < cutoff_30d_iso:
+                continue
+
             # Parse timestamp
             timestamp = datetime.fromisoformat(timestamp_str.replace("Z", "+00:00"))
             repo = extract_repo_from_cwd(cwd)
-            turn_count = len(lines)
-
-            session_data = {
-                "repo": repo,
-                "timestamp": timestamp,
-                "turns": turn_count,
-                "session_id": session_id
-            }
 
             # Categorize by time window
             if timestamp >= cutoff_7d:
-                sessions_7d.append(session_data)
+                sessions_7d += 1
+                turns_7d += turn_count
+                repo_sessions_7d[repo] += 1
+                repo_turns_7d[repo] += turn_count
+                if latest_ts is None or timestamp > latest_ts:
+                    latest_ts, latest_repo = timestamp, repo
                 # Track by date
                 session_date = timestamp.date().isoformat()
                 sessions_by_date[session_date]["sessions"] += 1
                 sessions_by_date[session_date]["turns"] += turn_count
 
             if timestamp >= cutoff_30d:
-                sessions_30d.append(session_data)
+                sessions_30d += 1
+                turns_30d += turn_count
 
         except (json.JSONDecodeError, KeyError, ValueError) as e:
             # Skip malformed sessions
             continue
 
-    # Aggregate by repo
-    def aggregate_repos(sessions: List[Dict]) -> List[Dict[str, Any]]:
-        repo_stats = defaultdict(lambda: {"sessions": 0, "turns": 0})
-        for session in sessions:
-            repo = session["repo"]
-            repo_stats[repo]["sessions"] += 1
-            repo_stats[repo]["turns"] += session["turns"]
+    meta_cache.save()
 
-        return [
-            {"repo": repo, "sessions": stats["sessions"], "turns": stats["turns"]}
-            for repo, stats in sorted(repo_stats.items(), key=lambda x: x[1]["sessions"], reverse=True)
-        ]
+    # Repos by session count
+    repos = [
+        {"repo": repo, "sessions": sessions, "turns": repo_turns_7d[repo]}
+        for repo, sessions in repo_sessions_7d.most_common()
+    ]
 
-    # Find last session
+    # Last session
     last_session = None
-    if sessions_7d:
-        latest = max(sessions_7d, key=lambda s: s["timestamp"])
-        hours_ago = (datetime.now(timezone.utc) - latest["timestamp"]).total_seconds() / 3600
+    if latest_ts is not None:
+        hours_ago = (datetime.now(timezone.utc) - latest_ts).total_seconds() / 3600
         last_session = {
-            "repo": latest["repo"],
-            "timestamp": latest["timestamp"].isoformat(),
+            "repo": latest_repo,
+            "timestamp": latest_ts.isoformat(),
             "hours_ago": round(hours_ago, 2)
         }
 
@@ -180,11 +250,11 @@ def parse_claude_sessions(sessions_dir: Path, days_back: int = 7) -> Dict[str, A
     ]
 
     return {
-        "sessions_7d": len(sessions_7d),
-        "sessions_30d": len(sessions_30d),
-        "turns_7d": sum(s["turns"] for s in sessions_7d),
-        "turns_30d": sum(s["turns"] for s in sessions_30d),
-        "repos": aggregate_repos(sessions_7d),
+        "sessions_7d": sessions_7d,
+        "sessions_30d": sessions_30d,
+        "turns_7d": turns_7d,
+        "turns_30d": turns_30d,
+        "repos": repos,
         "last_session": last_session,
         "daily_sessions": daily_sessions
     }
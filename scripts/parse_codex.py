@@ -1,11 +1,23 @@
 """Parse OpenAI Codex session data from ~/.codex/sessions/"""
 import json
+import os
+from functools import lru_cache
 from pathlib import Path
 from datetime import datetime, timezone, timedelta
-from collections import defaultdict
-from typing import Dict, List, Any
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any
 
+try:
+    from orjson import loads as json_loads  # Optional: faster JSON decoding
+except ImportError:
+    from json import loads as json_loads
 
+from json_cache import JsonCache
+from session_files import MAX_WORKERS, read_session_head, scandir_jsonl
+
+
+@lru_cache(maxsize=1024)  # Many sessions share a cwd
 def extract_repo_from_cwd(cwd: str) -> str:
     """Extract meaningful name from working directory"""
     if not cwd:
@@ -28,6 +40,56 @@ def extract_repo_from_cwd(cwd: str) -> str:
     return path.name if path.name else "unknown"
 
 
+# Per-file metadata cache: path -> {mtime_ns, size, timestamp, cwd, session_id,
+# turns}. Session logs are append-only, so a file whose mtime and size are
+# unchanged since the last run doesn't need to be opened again.
+SESSION_CACHE_FILE = Path(__file__).parent.parent / "data" / ".codex_session_cache.json"
+
+
+def read_session_meta(
+    entry: os.DirEntry,
+    cache: JsonCache,
+) -> Dict[str, Any]:
+    """
+    Metadata for one session file, reusing `cache` when the file is unchanged.
+
+    Every entry returned is marked used, so deleted files drop out of the
+    saved cache. `timestamp` is None for empty or malformed files.
+    """
+    st = entry.stat()
+    meta = cache.get(entry.path)
+    if meta and meta.get("mtime_ns") == st.st_mtime_ns and meta.get("size") == st.st_size:
+        cache.put(entry.path, meta)
+        return meta
+
+    meta = {"mtime_ns": st.st_mtime_ns, "size": st.st_size,
+            "timestamp": None, "cwd": None, "session_id": None, "turns": 0}
+    lines, meta["turns"] = read_session_head(Path(entry.path), 1)
+
+    if lines:
+        try:
+            # Parse first line for session metadata
+            first_line = json_loads(lines[0])
+        except ValueError:
+            first_line = None
+
+        if first_line is not None:
+            # Codex stores metadata in payload
+            if first_line.get("type") == "session_meta":
+                payload = first_line.get("payload", {})
+                meta["timestamp"] = payload.get("timestamp") or first_line.get("timestamp")
+                meta["cwd"] = payload.get("cwd")
+                meta["session_id"] = payload.get("id")
+            else:
+                # Fallback if format differs
+                meta["timestamp"] = first_line.get("timestamp")
+                meta["cwd"] = first_line.get("payload", {}).get("cwd")
+                meta["session_id"] = Path(entry.path).stem
+
+    cache.put(entry.path, meta)
+    return meta
+
+
 def extract_cwd_from_dirname(dirname: str) -> str:
     """
     Extract cwd from Codex session directory name.
@@ -51,91 +113,93 @@ def parse_codex_sessions(sessions_dir: Path, days_back: int = 7) -> Dict[str, An
     """
     cutoff_7d = datetime.now(timezone.utc) - timedelta(days=7)
     cutoff_30d = datetime.now(timezone.utc) - timedelta(days=30)
-
-    sessions_7d = []
-    sessions_30d = []
+    # ISO-8601 UTC ("...Z") strings sort chronologically, so older sessions
+    # can be rejected by string comparison before any datetime is built
+    cutoff_30d_iso = cutoff_30d.strftime("%Y-%m-%dT%H:%M:%S")
+
+    # 7-day figures are aggregated as sessions are seen, not kept per session
+    sessions_7d = 0
+    turns_7d = 0
+    repo_sessions_7d = Counter()
+    repo_turns_7d = Counter()
+    latest_ts = None
+    latest_repo = None
+    sessions_30d = 0
+    turns_30d = 0
     sessions_by_date = defaultdict(lambda: {"sessions": 0, "turns": 0})
 
-    # Find all session files
-    session_files = list(sessions_dir.rglob("*.jsonl"))
-
-    for session_file in session_files:
-        try:
-            with open(session_file, 'r') as f:
-                lines = f.readlines()
+    # Find all session files, skipping any last written before the 30-day
+    # window: its session started earlier still, so it can't count
+    cutoff_30d_epoch = cutoff_30d.timestamp()
+    session_files = [
+        entry for entry in scandir_jsonl(str(sessions_dir))
+        if entry.stat().st_mtime >= cutoff_30d_epoch
+    ]
 
-            if not lines:
-                continue
+    meta_cache = JsonCache(SESSION_CACHE_FILE).load()
 
-            # Parse first line for session metadata
-            first_line = json.loads(lines[0])
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        metas = list(executor.map(
+            lambda entry: read_session_meta(entry, meta_cache),
+            session_files,
+        ))
 
-            # Codex stores metadata in payload
-            if first_line.get("type") == "session_meta":
-                payload = first_line.get("payload", {})
-                timestamp_str = payload.get("timestamp") or first_line.get("timestamp")
-                cwd = payload.get("cwd")
-                session_id = payload.get("id")
-            else:
-                # Fallback if format differs
-                timestamp_str = first_line.get("timestamp")
-                cwd = first_line.get("payload", {}).get("cwd")
-                session_id = session_file.stem
+    for meta in metas:
+        try:
+            timestamp_str = meta["timestamp"]
+            cwd = meta["cwd"]
+            turn_count = meta["turns"]
 
             if not timestamp_str:
                 continue
 
+            # Fast reject: outside the 30-day window
+            if timestamp_str[-1:] == "Z" and timestamp_str[10:11] == "T" and timestamp_str < cutoff_30d_iso:
+                continue
+
             # Codex sometimes has null cwd - skip those for now
             # (Codex doesn't encode cwd in directory structure like Claude does)
 
             # Parse timestamp
             timestamp = datetime.fromisoformat(timestamp_str.replace("Z", "+00:00"))
             repo = extract_repo_from_cwd(cwd) if cwd else "unknown"
-            turn_count = len(lines)
-
-            session_data = {
-                "repo": repo,
-                "timestamp": timestamp,
-                "turns": turn_count,
-                "session_id": session_id
-            }
 
             # Categorize by time window
             if timestamp >= cutoff_7d:
-                sessions_7d.append(session_data)
+                sessions_7d += 1
+                turns_7d += turn_count
+                repo_sessions_7d[repo] += 1
+                repo_turns_7d[repo] += turn_count
+                if latest_ts is None or timestamp > latest_ts:
+                    latest_ts, latest_repo = timestamp, repo
                 # Track by date
                 session_date = timestamp.date().isoformat()
                 sessions_by_date[session_date]["sessions"] += 1
                 sessions_by_date[session_date]["turns"] += turn_count
 
             if timestamp >= cutoff_30d:
-                sessions_30d.append(session_data)
+                sessions_30d += 1
+                turns_30d += turn_count
 
         except (json.JSONDecodeError, KeyError, ValueError) as e:
             # Skip malformed sessions
             continue
 
-    # Aggregate by repo
-    def aggregate_repos(sessions: List[Dict]) -> List[Dict[str, Any]]:
-        repo_stats = defaultdict(lambda: {"sessions": 0, "turns": 0})
-        for session in sessions:
-            repo = session["repo"]
-            repo_stats[repo]["sessions"] += 1
-            repo_stats[repo]["turns"] += session["turns"]
+    meta_cache.save()
 
-        return [
-            {"repo": repo, "sessions": stats["sessions"], "turns": stats["turns"]}
-            for repo, stats in sorted(repo_stats.items(), key=lambda x: x[1]["sessions"], reverse=True)
-        ]
+    # Repos by session count
+    repos = [
+        {"repo": repo, "sessions": sessions, "turns": repo_turns_7d[repo]}
+        for repo, sessions in repo_sessions_7d.most_common()
+    ]
 
-    # Find last session
+    # Last session
     last_session = None
-    if sessions_7d:
-        latest = max(sessions_7d, key=lambda s: s["timestamp"])
-        hours_ago = (datetime.now(timezone.utc) - latest["timestamp"]).total_seconds() / 3600
+    if latest_ts is not None:
+        hours_ago = (datetime.now(timezone.utc) - latest_ts).total_seconds() / 3600
         last_session = {
-            "repo": latest["repo"],
-            "timestamp": latest["timestamp"].isoformat(),
+            "repo": latest_repo,
+            "timestamp": latest_ts.isoformat(),
             "hours_ago": round(hours_ago, 2)
         }
 
@@ -146,11 +210,11 @@ def parse_codex_sessions(sessions_dir: Path, days_back: int = 7) -> Dict[str, An
     ]
 
     return {
-        "sessions_7d": len(sessions_7d),
-        "sessions_30d": len(sessions_30d),
-        "turns_7d": sum(s["turns"] for s in sessions_7d),
-        "turns_30d": sum(s["turns"] for s in sessions_30d),
-        "repos": aggregate_repos(sessions_7d),
+        "sessions_7d": sessions_7d,
+        "sessions_30d": sessions_30d,
+        "turns_7d": turns_7d,
+        "turns_30d": turns_30d,
+        "repos": repos,
         "last_session": last_session,
         "daily_sessions": daily_sessions
     }
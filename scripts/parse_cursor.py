@@ -4,16 +4,45 @@ import json
 from pathlib import Path
 from datetime import datetime, timezone, timedelta
 from collections import defaultdict
-from typing import Dict, Any
-
-
-def parse_cursor_sessions(db_path: Path = None, days_back: int = 7) -> Dict[str, Any]:
+from typing import Callable, Dict, Any
+
+try:
+    from orjson import loads as json_loads  # Optional: faster JSON decoding
+except ImportError:
+    from json import loads as json_loads
+
+
+# Keys are "composerData:<composerId>" and "bubbleId:<composerId>:<bubbleId>";
+# the composer id is the field after the first colon.
+COMPOSERS_QUERY = """
+    SELECT c.key, c.value, COALESCE(b.cnt, 0)
+    FROM (
+        SELECT key, value, substr(key, 14) AS rest
+        FROM cursorDiskKV WHERE key LIKE 'composerData:%'
+    ) c
+    LEFT JOIN (
+        SELECT
+            CASE WHEN instr(rest, ':') > 0
+                 THEN substr(rest, 1, instr(rest, ':') - 1) ELSE rest END AS cid,
+            COUNT(*) AS cnt
+        FROM (SELECT substr(key, 10) AS rest FROM cursorDiskKV WHERE key LIKE 'bubbleId:%')
+        GROUP BY cid
+    ) b
+    ON b.cid = CASE WHEN instr(c.rest, ':') > 0
+                    THEN substr(c.rest, 1, instr(c.rest, ':') - 1) ELSE c.rest END
+"""
+
+
+def parse_cursor_sessions(
+    db_path: Path = None, days_back: int = 7, log: Callable[[str], None] = print
+) -> Dict[str, Any]:
     """
     Parse Cursor IDE composer sessions from global storage database.
 
     Args:
         db_path: Path to state.vscdb (defaults to standard location)
         days_back: Number of days to include in analysis
+        log: Receives warnings (print by default)
 
     Returns:
         dict with sessions_Xd, turns_Xd, repos (empty for now), last_session
@@ -22,66 +51,64 @@ def parse_cursor_sessions(db_path: Path = None, days_back: int = 7) -> Dict[str,
         db_path = Path.home() / "Library/Application Support/Cursor/User/globalStorage/state.vscdb"
 
     if not db_path.exists():
-        print(f"⚠️  Cursor database not found: {db_path}")
+        log(f"⚠️  Cursor database not found: {db_path}")
         return _empty_result()
 
     cutoff_7d = datetime.now(timezone.utc) - timedelta(days=7)
     cutoff_30d = datetime.now(timezone.utc) - timedelta(days=30)
+    # createdAt is epoch milliseconds; compare before building a datetime
+    cutoff_30d_ms = cutoff_30d.timestamp() * 1000
 
     try:
         conn = sqlite3.connect(db_path)
+        # Memory-map the database and give the page cache 64 MiB, since
+        # the KV table is scanned end to end
+        conn.execute("PRAGMA mmap_size=268435456")
+        conn.execute("PRAGMA cache_size=-65536")
         cursor = conn.cursor()
 
-        # First pass: count messages (bubbles) per composer
-        cursor.execute("SELECT key FROM cursorDiskKV WHERE key LIKE 'bubbleId:%'")
-        message_counts = defaultdict(int)
-        for (key,) in cursor.fetchall():
-            parts = key.split(':')
-            if len(parts) >= 2:
-                composer_id = parts[1]
-                message_counts[composer_id] += 1
-
-        # Second pass: get composer metadata
-        cursor.execute("SELECT key, value FROM cursorDiskKV WHERE key LIKE 'composerData:%'")
-
-        sessions_7d = []
-        sessions_30d = []
+        # Composer metadata joined with its message (bubble) count, so no
+        # per-key Python pass or intermediate result list is needed
+        cursor.execute(COMPOSERS_QUERY)
+
+        # 7-day figures are aggregated as sessions are seen
+        sessions_7d = 0
+        turns_7d = 0
+        latest_ts = None
+        latest_mode = None
+        sessions_30d = 0
+        turns_30d = 0
         sessions_by_date = defaultdict(lambda: {"sessions": 0, "turns": 0})
 
-        for key, value_blob in cursor.fetchall():
+        for key, value_blob, message_count in cursor:
             try:
                 if not value_blob:
                     continue
 
-                composer_id = key.split(':')[1]
-                data = json.loads(value_blob)
+                data = json_loads(value_blob)
 
                 created_at = data.get('createdAt')
-                if not created_at:
+                if not created_at or created_at < cutoff_30d_ms:
                     continue
 
                 timestamp = datetime.fromtimestamp(created_at / 1000, tz=timezone.utc)
 
-                # Get actual message count from bubbles
-                message_count = message_counts.get(composer_id, 0)
+                # Actual message count comes from bubbles
                 turns = message_count if message_count > 0 else 1  # Min 1 for session creation
 
-                session_data = {
-                    "composerId": composer_id,
-                    "timestamp": timestamp,
-                    "mode": data.get('unifiedMode', 'unknown'),
-                    "turns": turns
-                }
-
                 # Categorize by time window
                 if timestamp >= cutoff_7d:
-                    sessions_7d.append(session_data)
+                    sessions_7d += 1
+                    turns_7d += turns
+                    if latest_ts is None or timestamp > latest_ts:
+                        latest_ts, latest_mode = timestamp, data.get('unifiedMode', 'unknown')
                     session_date = timestamp.date().isoformat()
                     sessions_by_date[session_date]["sessions"] += 1
                     sessions_by_date[session_date]["turns"] += turns
 
                 if timestamp >= cutoff_30d:
-                    sessions_30d.append(session_data)
+                    sessions_30d += 1
+                    turns_30d += turns
 
             except (json.JSONDecodeError, KeyError, ValueError):
                 continue
@@ -89,17 +116,16 @@ def parse_cursor_sessions(db_path: Path = None, days_back: int = 7) -> Dict[str,
         conn.close()
 
     except sqlite3.Error as e:
-        print(f"⚠️  SQLite error: {e}")
+        log(f"⚠️  SQLite error: {e}")
         return _empty_result()
 
     # Find last session
     last_session = None
-    if sessions_7d:
-        latest = max(sessions_7d, key=lambda s: s["timestamp"])
-        hours_ago = (datetime.now(timezone.utc) - latest["timestamp"]).total_seconds() / 3600
+    if latest_ts is not None:
+        hours_ago = (datetime.now(timezone.utc) - latest_ts).total_seconds() / 3600
         last_session = {
-            "mode": latest["mode"],
-            "timestamp": latest["timestamp"].isoformat(),
+            "mode": latest_mode,
+            "timestamp": latest_ts.isoformat(),
             "hours_ago": round(hours_ago, 2)
         }
 
@@ -110,10 +136,10 @@ def parse_cursor_sessions(db_path: Path = None, days_back: int = 7) -> Dict[str,
     ]
 
     return {
-        "sessions_7d": len(sessions_7d),
-        "sessions_30d": len(sessions_30d),
-        "turns_7d": sum(s["turns"] for s in sessions_7d),
-        "turns_30d": sum(s["turns"] for s in sessions_30d),
+        "sessions_7d": sessions_7d,
+        "sessions_30d": sessions_30d,
+        "turns_7d": turns_7d,
+        "turns_30d": turns_30d,
         "repos": [],  # Cursor doesn't track per-repo like Claude/Codex
         "last_session": last_session,
         "daily_sessions": daily_sessions
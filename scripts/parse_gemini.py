@@ -3,25 +3,35 @@
 Parse Gemini CLI session data from ~/.gemini/tmp/*/logs.json
 """
 import json
-import os
-from collections import defaultdict
-from datetime import datetime, timedelta
+from collections import Counter
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import Dict, List, Any
+from typing import Callable, Dict, Any
 
+from session_files import scandir_files
+from timestamps import parse_ts
 
-def parse_gemini_sessions() -> Dict[str, Any]:
+try:
+    from orjson import loads as json_loads  # Optional: faster JSON decoding
+except ImportError:
+    from json import loads as json_loads
+
+
+def parse_gemini_sessions(log: Callable[[str], None] = print) -> Dict[str, Any]:
     """
     Parse Gemini CLI sessions from logs.json files.
 
     Returns:
         Dict with sessions_7d, sessions_30d, turns_7d, turns_30d, and daily_sessions
+
+    Progress and warnings go through `log`, so a caller running this on a
+    worker thread can print them itself, in order with its own output.
     """
     gemini_dir = Path.home() / ".gemini"
     tmp_dir = gemini_dir / "tmp"
 
     if not tmp_dir.exists():
-        print(f"   ⚠️  No Gemini tmp directory found at {tmp_dir}")
+        log(f"   ⚠️  No Gemini tmp directory found at {tmp_dir}")
         return {
             "sessions_7d": 0,
             "sessions_30d": 0,
@@ -31,11 +41,11 @@ def parse_gemini_sessions() -> Dict[str, Any]:
         }
 
     # Find all logs.json files
-    logs_files = list(tmp_dir.rglob("logs.json"))
-    print(f"   Found {len(logs_files)} logs files")
+    logs_files = [Path(entry.path) for entry in scandir_files(str(tmp_dir), lambda name: name == "logs.json")]
+    log(f"   Found {len(logs_files)} logs files")
 
     if not logs_files:
-        print(f"   ⚠️  No logs.json files found")
+        log(f"   ⚠️  No logs.json files found")
         return {
             "sessions_7d": 0,
             "sessions_30d": 0,
@@ -51,13 +61,19 @@ def parse_gemini_sessions() -> Dict[str, Any]:
     turns_30d = 0
 
     # Track daily sessions
-    daily_sessions = defaultdict(int)
+    daily_sessions = Counter()
+
+    # A message is in the 7-day window when (now - timestamp).days <= 7,
+    # i.e. it is less than 8 days old. Naive timestamps compare against
+    # local time, as before.
+    cutoff_7d = datetime.now(timezone.utc) - timedelta(days=8)
+    cutoff_7d_naive = datetime.now() - timedelta(days=8)
 
     # Parse all logs
     for logs_file in logs_files:
         try:
-            with open(logs_file, 'r') as f:
-                messages = json.load(f)
+            with open(logs_file, 'rb') as f:
+                messages = json_loads(f.read())
 
             for msg in messages:
                 if msg.get("type") != "user":
@@ -72,13 +88,10 @@ def parse_gemini_sessions() -> Dict[str, Any]:
 
                 # Parse timestamp
                 try:
-                    timestamp = datetime.fromisoformat(timestamp_str.replace("Z", "+00:00"))
+                    timestamp = parse_ts(timestamp_str)
                 except:
                     continue
 
-                now = datetime.now(timestamp.tzinfo) if timestamp.tzinfo else datetime.now()
-                days_ago = (now - timestamp).days
-
                 # Add to 30-day tracking
                 sessions_30d.add(session_id)
                 turns_30d += 1
@@ -88,12 +101,12 @@ def parse_gemini_sessions() -> Dict[str, Any]:
                 daily_sessions[date_str] += 1
 
                 # Add to 7-day tracking
-                if days_ago <= 7:
+                if timestamp > (cutoff_7d if timestamp.tzinfo else cutoff_7d_naive):
                     sessions_7d.add(session_id)
                     turns_7d += 1
 
         except Exception as e:
-            print(f"   ⚠️  Error parsing {logs_file}: {e}")
+            log(f"   ⚠️  Error parsing {logs_file}: {e}")
             continue
 
     # Convert daily sessions to sorted list (last 30 days)
@@ -1,17 +1,37 @@
 """Parse GitHub activity from local git repositories"""
+import json
+import os
 import subprocess
+import time
 from pathlib import Path
 from datetime import datetime, timezone, timedelta
-from collections import defaultdict
-from typing import Dict, List, Any, Optional
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Any, Optional, Tuple
+
+try:
+    import pygit2  # Optional: read history and the index in-process, no `git` spawn
+except ImportError:
+    pygit2 = None
+
+from json_cache import JsonCache
+from session_files import MAX_WORKERS
 
 
 def get_git_repos(git_dir: Path) -> List[Path]:
     """Find all git repositories in the git directory"""
     repos = []
-    for item in git_dir.iterdir():
-        if item.is_dir() and (item / ".git").exists():
-            repos.append(item)
+    # DirEntry answers is_dir() from the directory listing on most
+    # filesystems, leaving one stat per child for its .git
+    with os.scandir(git_dir) as it:
+        for entry in it:
+            if not entry.is_dir():
+                continue
+            try:
+                os.stat(os.path.join(entry.path, ".git"))
+            except OSError:
+                continue
+            repos.append(Path(entry.path))
     return repos
 
 
@@ -19,16 +39,23 @@ def get_commits_since(repo_path: Path, days: int) -> List[Dict[str, Any]]:
     """
     Get commits from a repo since N days ago.
 
-    Returns list of {timestamp, message, files_changed}
+    Returns list of {hash, timestamp, date, message}: timestamp is the author
+    time in unix seconds, date its YYYY-MM-DD in the author's own timezone.
     """
     cutoff = datetime.now(timezone.utc) - timedelta(days=days)
+
+    if pygit2 is not None:
+        commits = _commits_since_pygit2(repo_path, cutoff)
+        if commits is not None:
+            return commits
+
     since_arg = cutoff.strftime("%Y-%m-%d")
 
     try:
         # Get commit log with timestamp and message
         result = subprocess.run(
             ["git", "-C", str(repo_path), "log", f"--since={since_arg}",
-             "--format=%H|%aI|%s", "--no-merges"],
+             "--format=%H|%at|%ad|%s", "--date=format:%Y-%m-%d", "--no-merges"],
             capture_output=True,
             text=True,
             timeout=5
@@ -42,16 +69,16 @@ def get_commits_since(repo_path: Path, days: int) -> List[Dict[str, Any]]:
             if not line:
                 continue
 
-            parts = line.split("|", 2)
-            if len(parts) != 3:
+            parts = line.split("|", 3)
+            if len(parts) != 4:
                 continue
 
-            commit_hash, timestamp_str, message = parts
-            timestamp = datetime.fromisoformat(timestamp_str.replace("Z", "+00:00"))
+            commit_hash, timestamp_str, date_str, message = parts
 
             commits.append({
                 "hash": commit_hash,
-                "timestamp": timestamp,
+                "timestamp": int(timestamp_str),
+                "date": date_str,
                 "message": message
             })
 
@@ -61,27 +88,115 @@ def get_commits_since(repo_path: Path, days: int) -> List[Dict[str, Any]]:
         return []
 
 
+def _commits_since_pygit2(repo_path: Path, cutoff: datetime) -> Optional[List[Dict[str, Any]]]:
+    """
+    get_commits_since via pygit2: walk HEAD newest-first by commit time,
+    stopping at the cutoff. Returns None if pygit2 can't read the repo, so
+    the caller falls back to `git log`.
+    """
+    try:
+        repo = pygit2.Repository(str(repo_path))
+        if repo.head_is_unborn:
+            return []
+
+        cutoff_epoch = cutoff.timestamp()
+        commits = []
+        for commit in repo.walk(repo.head.target, pygit2.GIT_SORT_TIME):
+            if commit.commit_time < cutoff_epoch:
+                break
+            if len(commit.parent_ids) > 1:  # --no-merges
+                continue
+
+            author = commit.author
+            commits.append({
+                "hash": str(commit.id),
+                "timestamp": author.time,
+                "date": time.strftime("%Y-%m-%d", time.gmtime(author.time + author.offset * 60)),
+                # %s: the subject paragraph, joined onto one line
+                "message": " ".join(commit.message.strip().split("\n\n", 1)[0].split("\n")),
+            })
+        return commits
+
+    except (pygit2.GitError, KeyError, ValueError):
+        return None
+
+
+# On-disk cache of repo path -> {index_mtime_ns, language}. `git ls-files`
+# lists the index, so a repo's language is reused until .git/index changes.
+LANGUAGE_CACHE_FILE = Path(__file__).parent.parent / "data" / ".language_cache.json"
+
+_language_cache = JsonCache(LANGUAGE_CACHE_FILE)
+
+
+def detect_language_cached(repo_path: Path) -> Optional[str]:
+    """detect_language, skipped while the repo's index is unchanged."""
+    try:
+        index_mtime_ns = os.stat(os.path.join(repo_path, ".git", "index")).st_mtime_ns
+    except OSError:
+        return detect_language(repo_path)
+
+    key = str(repo_path)
+    cached = _language_cache.get(key)
+    if not cached or cached.get("index_mtime_ns") != index_mtime_ns:
+        cached = {"index_mtime_ns": index_mtime_ns, "language": detect_language(repo_path)}
+    _language_cache.put(key, cached)
+    return cached["language"]
+
+
+# File extension -> language, for detect_language
+LANGUAGE_EXTENSIONS = {
+    ".py": "Python",
+    ".js": "JavaScript",
+    ".ts": "TypeScript",
+    ".go": "Go",
+    ".rs": "Rust",
+    ".java": "Java",
+    ".rb": "Ruby",
+    ".sh": "Shell",
+    ".c": "C",
+    ".cpp": "C++",
+}
+
+
+def _primary_language(paths: Iterable[str]) -> Optional[str]:
+    """Most common known language among the given file paths."""
+    ext_counts = {}
+    for line in paths:
+        if not line:
+            continue
+        # Same as Path(line).suffix, without building a Path per file:
+        # the last dot in the file name, unless it leads the name
+        name = line[line.rfind("/") + 1:]
+        dot = name.rfind(".")
+        if dot > 0:
+            suffix = name[dot:]
+            if suffix in LANGUAGE_EXTENSIONS:
+                ext_counts[suffix] = ext_counts.get(suffix, 0) + 1
+
+    if not ext_counts:
+        return None
+
+    # Return most common
+    most_common = max(ext_counts.items(), key=lambda x: x[1])[0]
+    return LANGUAGE_EXTENSIONS[most_common]
+
+
 def detect_language(repo_path: Path) -> Optional[str]:
     """
     Detect primary language of repo by file extensions.
     Simple heuristic for MVP.
     """
-    extensions = {
-        ".py": "Python",
-        ".js": "JavaScript",
-        ".ts": "TypeScript",
-        ".go": "Go",
-        ".rs": "Rust",
-        ".java": "Java",
-        ".rb": "Ruby",
-        ".sh": "Shell",
-        ".c": "C",
-        ".cpp": "C++",
-    }
+    if pygit2 is not None:
+        try:
+            # The index is what `git ls-files` lists
+            return _primary_language(entry.path for entry in pygit2.Repository(str(repo_path)).index)
+        except (pygit2.GitError, KeyError, ValueError):
+            pass  # Fall back to `git ls-files`
 
     try:
         result = subprocess.run(
-            ["git", "-C", str(repo_path), "ls-files"],
+            ["git", "-C", str(repo_path), "ls-files", "-z"],
+            stdin=subprocess.DEVNULL,
             capture_output=True,
             text=True,
             timeout=5
@@ -90,26 +205,32 @@ def detect_language(repo_path: Path) -> Optional[str]:
         if result.returncode != 0:
             return None
 
-        # Count file extensions
-        ext_counts = defaultdict(int)
-        for line in result.stdout.strip().split("\n"):
-            if not line:
-                continue
-            suffix = Path(line).suffix
-            if suffix in extensions:
-                ext_counts[suffix] += 1
-
-        if not ext_counts:
-            return None
-
-        # Return most common
-        most_common = max(ext_counts.items(), key=lambda x: x[1])[0]
-        return extensions[most_common]
+        # NUL-delimited, so odd names need no unquoting
+        return _primary_language(result.stdout.split("\0"))
 
     except (subprocess.TimeoutExpired, subprocess.CalledProcessError):
         return None
 
 
+def scan_repo(repo_path: Path, now: datetime) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]], List[Dict[str, Any]], Optional[str]]:
+    """
+    Run every git query for one repo.
+
+    One `git log` covers the past year; the 30d and 7d windows are filtered
+    out of it by timestamp. Returns (commits_7d, commits_30d, commits_365d,
+    language); language is only detected for repos active in the last 30 days.
+    """
+    commits_365d = get_commits_since(repo_path, 365)
+
+    cutoff_30d = (now - timedelta(days=30)).timestamp()
+    cutoff_7d = (now - timedelta(days=7)).timestamp()
+    commits_30d = [c for c in commits_365d if c["timestamp"] >= cutoff_30d]
+    commits_7d = [c for c in commits_30d if c["timestamp"] >= cutoff_7d]
+
+    language = detect_language_cached(repo_path) if commits_30d else None
+    return commits_7d, commits_30d, commits_365d, language
+
+
 def parse_github_activity(git_dir: Path) -> Dict[str, Any]:
     """
     Parse GitHub activity from local git repositories.
@@ -124,19 +245,22 @@ def parse_github_activity(git_dir: Path) -> Dict[str, Any]:
     commits_7d_total = 0
     commits_30d_total = 0
 
-    repo_commits_7d = defaultdict(int)
-    language_commits_30d = defaultdict(int)
-    commits_by_date = defaultdict(int)  # Track daily commits
+    repo_commits_7d = Counter()
+    language_commits_30d = Counter()
+    commits_by_date = Counter()  # Track daily commits
 
-    last_push_data = None
     last_push_time = None
+    last_push_repo = None
 
-    for repo_path in repos:
-        repo_name = repo_path.name
+    _language_cache.load()
+    # Each repo costs a few blocking `git` subprocesses; run repos concurrently
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        now = datetime.now(timezone.utc)
+        scans = list(executor.map(lambda repo_path: scan_repo(repo_path, now), repos))
+    _language_cache.save()
 
-        # Get commits for different windows
-        commits_7d = get_commits_since(repo_path, 7)
-        commits_30d = get_commits_since(repo_path, 30)
+    for repo_path, (commits_7d, commits_30d, commits_365d, language) in zip(repos, scans):
+        repo_name = repo_path.name
 
         if commits_7d:
             repos_7d.add(repo_name)
@@ -144,41 +268,44 @@ def parse_github_activity(git_dir: Path) -> Dict[str, Any]:
             repo_commits_7d[repo_name] = len(commits_7d)
 
             # Track last push
-            latest_commit = max(commits_7d, key=lambda c: c["timestamp"])
-            if last_push_time is None or latest_commit["timestamp"] > last_push_time:
-                last_push_time = latest_commit["timestamp"]
-                hours_ago = (datetime.now(timezone.utc) - latest_commit["timestamp"]).total_seconds() / 3600
-                last_push_data = {
-                    "repo": repo_name,
-                    "timestamp": latest_commit["timestamp"].isoformat(),
-                    "hours_ago": round(hours_ago, 2)
-                }
+            latest_time = max(c["timestamp"] for c in commits_7d)
+            if last_push_time is None or latest_time > last_push_time:
+                last_push_time = latest_time
+                last_push_repo = repo_name
 
         if commits_30d:
             repos_30d.add(repo_name)
             commits_30d_total += len(commits_30d)
 
             # Aggregate language stats
-            language = detect_language(repo_path)
             if language:
                 language_commits_30d[language] += len(commits_30d)
 
         # Daily commit counts across the past year, for the contribution
         # calendar (commit's own timezone, not UTC).
-        for commit in get_commits_since(repo_path, 365):
-            commit_date = commit["timestamp"].date().isoformat()
-            commits_by_date[commit_date] += 1
+        commits_by_date.update(commit["date"] for commit in commits_365d)
+
+    # Last push, converted from unix time only here
+    last_push_data = None
+    if last_push_time is not None:
+        last_push_dt = datetime.fromtimestamp(last_push_time, timezone.utc)
+        hours_ago = (datetime.now(timezone.utc) - last_push_dt).total_seconds() / 3600
+        last_push_data = {
+            "repo": last_push_repo,
+            "timestamp": last_push_dt.isoformat(),
+            "hours_ago": round(hours_ago, 2)
+        }
 
     # Top repos by commits in 7d
     top_repos = [
         {"repo": repo, "commits": count}
-        for repo, count in sorted(repo_commits_7d.items(), key=lambda x: x[1], reverse=True)[:5]
+        for repo, count in repo_commits_7d.most_common(5)
     ]
 
     # Language distribution
     languages = [
         {"name": lang, "commits": count}
-        for lang, count in sorted(language_commits_30d.items(), key=lambda x: x[1], reverse=True)
+        for lang, count in language_commits_30d.most_common()
     ]
 
     # Convert daily commits to sorted array
@@ -207,7 +334,6 @@ def main():
         print(f"Git directory not found: {git_dir}")
         return
 
-    import json
     result = parse_github_activity(git_dir)
     print(json.dumps(result, indent=2))
 
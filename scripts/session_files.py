@@ -0,0 +1,76 @@
+"""Finding and reading session log files, shared by the session parsers."""
+import os
+from pathlib import Path
+from typing import Callable, Iterator, List, Tuple
+
+
+def scandir_files(root: str, match: Callable[[str], bool]) -> Iterator[os.DirEntry]:
+    """
+    Yield every file under root whose name passes `match`, in rglob order.
+
+    os.scandir exposes each entry's type from the directory listing, so
+    the walk doesn't stat every path the way pathlib's rglob does.
+    """
+    subdirs = []
+    try:
+        with os.scandir(root) as it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    subdirs.append(entry.path)
+                elif match(entry.name) and entry.is_file():
+                    yield entry
+    except OSError:
+        return
+    for subdir in subdirs:
+        yield from scandir_files(subdir, match)
+
+
+def scandir_jsonl(root: str) -> Iterator[os.DirEntry]:
+    """Yield every *.jsonl file under root, in the same order as rglob."""
+    return scandir_files(root, lambda name: name.endswith(".jsonl"))
+
+
+# Session transcripts can run to many MB; only their first lines are parsed,
+# the rest is just counted in chunks of this size.
+READ_CHUNK = 1 << 20
+
+
+def read_session_head(session_file: Path, max_lines: int) -> Tuple[List[bytes], int]:
+    """
+    Return the first `max_lines` raw lines of a JSONL file and its line count.
+
+    Reads in binary and counts newlines in the remainder, so a long
+    transcript is never decoded or held in memory as a list of lines.
+    """
+    with open(session_file, 'rb') as f:
+        head = []
+        for _ in range(max_lines):
+            line = f.readline()
+            if not line:
+                break
+            head.append(line)
+
+        newlines = sum(1 for line in head if line.endswith(b"\n"))
+        last = head[-1][-1:] if head else b""
+
+        # The remainder is read into one reused buffer and counted in place,
+        # so a large file doesn't allocate a new bytes object per chunk
+        remaining = os.fstat(f.fileno()).st_size - f.tell()
+        if remaining > 0:
+            buf = bytearray(min(remaining, READ_CHUNK))
+            while True:
+                n = f.readinto(buf)
+                if not n:
+                    break
+                newlines += buf.count(b"\n", 0, n)
+                last = buf[n - 1:n]
+
+    # A final line without a trailing newline still counts
+    if last and last != b"\n":
+        newlines += 1
+    return head, newlines
+
+
+# Reading session files is I/O-bound (read() releases the GIL), so heads are
+# read on a thread pool of this size.
+MAX_WORKERS = min(32, (os.cpu_count() or 1) * 4)
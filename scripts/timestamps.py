@@ -0,0 +1,13 @@
+"""ISO-8601 timestamp parsing shared by the collectors and parsers."""
+import sys
+from datetime import datetime
+
+if sys.version_info >= (3, 11):
+    # Accepts a trailing "Z" natively, no string rewrite per timestamp
+    parse_ts = datetime.fromisoformat
+else:
+    def parse_ts(value: str) -> datetime:
+        """datetime.fromisoformat, also accepting a trailing "Z" for UTC."""
+        if value.endswith("Z"):
+            value = value[:-1] + "+00:00"
+        return datetime.fromisoformat(value)